@@ -1,32 +1,230 @@
-from PIL import Image, ImageDraw, ImageFont
-import cv2
+from PIL import Image
+import numpy as np
 import glob
 import os
-from imageio import mimread
 from math import sqrt
 from random import randint
 import colorsys
-from itertools import islice
+import hashlib
+import json
+from itertools import chain, islice
+from collections import deque
 from datetime import datetime
-import multiprocessing
+import threading
+import queue
+import traceback
+import copy
+import contextlib
 
 #typing imports
 from io import IOBase
-from typing import List, Tuple, Union, Any
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Tuple, Union, Any
 
 # lib imports
-from .url_ import urlcheck, download, requestsNotInstalled
+from .url_ import urlcheck, download, stream, requestsNotInstalled, _Download
 from . import palettes
+from .cache import ConversionCache
+from .stats import ConversionStats
+from .progress import Progress, _ProgressReporter, _print_progress
+from .media import MediaInfo, probe
+from .text import _TextWriter, _format_text, _text_modes
+
+# opencv, multiprocessing, asyncio and PIL's drawing modules are imported where they are first needed,
+# so importing asciipy (and short cli runs) doesn't pay for the parts of it that aren't used
+if TYPE_CHECKING:
+    import concurrent.futures
+    import multiprocessing
+    import multiprocessing.pool
+    import cv2
+    from PIL import ImageFont
 
 __version__ = "0.3.0"
 
 _chars = "gS#%@"
+# with reduced_decode, sources are reduced to no less than this many times the output size before the final resample. cell colors stay close to
+# resampling the full source, but most cells end up a few levels off, and some land on a different character or palette color
+_reducing_gap = 3
+# fewest rows a render thread gets, smaller bands cost more in thread handoffs than they save
+_min_band_rows = 16
+
+class _Cancelled(Exception):
+    # raised inside a conversion once its awaiting task was cancelled
+    pass
+
+# shared by every stage while instrumentation is off, so a disabled stage costs one attribute check
+_no_stage = contextlib.nullcontext()
 
 def _remap(x, in_min, in_max, out_min, out_max):
     ind = round((x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min)
     if ind > out_max: ind = out_max
     return ind
 
+def _remap_array(x: np.ndarray, in_min, in_max, out_min, out_max) -> np.ndarray:
+    # same arithmetic as _remap, np.rint rounds half to even like round()
+    ind = np.rint((x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min).astype(np.intp)
+    return np.minimum(ind, out_max)
+
+def _nearest_color(rgb: np.ndarray, palette: List[Tuple[int, int, int]]) -> np.ndarray:
+    # the compiled table resolves ties to the smallest color, matching min() over (diff, color) tuples
+    colors, _ = palettes._compile(palette)
+    return colors[palettes._lookup(palette, rgb)]
+
+def _hls_value(m1: np.ndarray, m2: np.ndarray, hue: np.ndarray) -> np.ndarray:
+    hue = hue % 1.0
+    return np.where(hue < colorsys.ONE_SIXTH, m1 + (m2-m1)*hue*6.0,
+           np.where(hue < 0.5, m2,
+           np.where(hue < colorsys.TWO_THIRD, m1 + (m2-m1)*(colorsys.TWO_THIRD-hue)*6.0, m1)))
+
+def _darken_hls(rgb: np.ndarray, darken: float) -> np.ndarray:
+    # colorsys.rgb_to_hls -> scale luma -> colorsys.hls_to_rgb for a whole array, step for step so results match exactly
+    r, g, b = (rgb[..., i] / 255.0 for i in range(3))
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    gray = minc == maxc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(l <= 0.5, rangec / sumc, rangec / (2.0-maxc-minc))
+        rc = (maxc-r) / rangec
+        gc = (maxc-g) / rangec
+        bc = (maxc-b) / rangec
+        h = np.where(r == maxc, bc-gc, np.where(g == maxc, 2.0+rc-bc, 4.0+gc-rc))
+        h = (h/6.0) % 1.0
+    h = np.where(gray, 0.0, h)
+    s = np.where(gray, 0.0, s)
+
+    l = np.clip(l * darken, 0.0, 1.0)
+    m2 = np.where(l <= 0.5, l * (1.0+s), l+s-(l*s))
+    m1 = 2.0*l - m2
+    out = np.stack((_hls_value(m1, m2, h+colorsys.ONE_THIRD), _hls_value(m1, m2, h), _hls_value(m1, m2, h-colorsys.ONE_THIRD)), axis=-1)
+    out = np.where((s == 0.0)[..., None], l[..., None], out)
+    return (out * 255).astype(np.int32)
+
+def _ink_array(colors: np.ndarray, bands: int) -> np.ndarray:
+    # mirrors how PIL turns a fill tuple into a pixel: clipped, alpha defaults to 255 and is dropped for RGB
+    colors = np.clip(colors, 0, 255)
+    if bands == 3:
+        return colors[..., :3]
+    if colors.shape[-1] == 3:
+        return np.concatenate((colors, np.full(colors.shape[:-1] + (1,), 255, dtype=colors.dtype)), axis=-1)
+    return colors
+
+def _blend_glyphs(canvas: np.ndarray, mask: np.ndarray, ink: np.ndarray, pool: "_CanvasPool"=None) -> None:
+    # same math as PIL's fill_mask_L, which ImageDraw.text uses to draw a glyph onto an image
+    get = pool.get if pool is not None else lambda name, shape, dtype: np.empty(shape, dtype=dtype)
+    ink = ink.astype(np.uint16)
+    weight = get("weight", mask.shape, np.uint16)
+    inverse = get("inverse", mask.shape, np.uint16)
+    blended = get("blended", mask.shape, np.uint16)
+    shifted = get("shifted", mask.shape, np.uint16)
+    np.copyto(weight, mask)
+    if canvas.shape[-1] == 4:
+        # color bands are fully inked where the canvas is still fully transparent
+        inked = get("inked", mask.shape, bool)
+        clear = get("clear", mask.shape, bool)
+        np.not_equal(mask, 0, out=inked)
+        np.equal(canvas[..., 3], 0, out=clear)
+        inked &= clear
+        np.copyto(weight, 255, where=inked)
+    for band in range(canvas.shape[-1]):
+        if band == 3:
+            np.copyto(weight, mask)
+        np.subtract(255, weight, out=inverse)
+        np.multiply(canvas[..., band], inverse, out=blended)
+        np.multiply(weight, ink[..., band], out=shifted)
+        blended += shifted
+        blended += 128
+        np.right_shift(blended, 8, out=shifted)
+        blended += shifted
+        blended >>= 8
+        np.copyto(canvas[..., band], blended, casting="unsafe")
+
+
+def _hash_source(source: Union[os.PathLike, IOBase, str]) -> str:
+    # sha256 of a file, or of a seekable file object which is rewound afterwards. None when it can't be read
+    digest = hashlib.sha256()
+    if isinstance(source, IOBase):
+        if not source.seekable():
+            return None
+        position = source.tell()
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+        source.seek(position)
+        return digest.hexdigest()
+    try:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except (OSError, TypeError):
+        return None
+    return digest.hexdigest()
+
+class _CanvasPool:
+    """reusable frame buffers, so consecutive frames are rendered without allocating new canvases."""
+    def __init__(self) -> None:
+        self._buffers: Dict[Tuple[Any, ...], Any] = {}
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        key = (name, shape, dtype)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    def image(self, mode: str, size: Tuple[int, int]) -> Image.Image:
+        key = ("image", mode, size)
+        im = self._buffers.get(key)
+        if im is None:
+            im = self._buffers[key] = Image.new(mode, size)
+        return im
+
+    def band(self, index: int) -> "_CanvasPool":
+        # every band rendered in parallel needs its own scratch buffers
+        key = ("band", index)
+        pool = self._buffers.get(key)
+        if pool is None:
+            pool = self._buffers[key] = _CanvasPool()
+        return pool
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # buffers are cheap to recreate, so they aren't copied into worker processes
+        return {"_buffers": {}}
+
+
+class _GlyphAtlas:
+    """alpha masks for every character in a converters character set, rendered once and reused for every cell."""
+    def __init__(self, font: Union["ImageFont.ImageFont", "ImageFont.FreeTypeFont", None], chars: str) -> None:
+        from PIL import ImageDraw
+        d = ImageDraw.Draw(Image.new("L", (1, 1)))
+        if font is None:
+            font = d.getfont()
+        self.cell: Tuple[int, int] = d.textsize(chars[-1], font=font)
+        self.sizes: List[Tuple[int, int]] = [d.textsize(char, font=font) for char in chars]
+        self.masks: List[np.ndarray] = []
+        self.offsets: List[Tuple[int, int]] = []
+        self.tiles = np.zeros((len(chars), self.cell[1], self.cell[0]), dtype=np.uint8)
+        # true when no glyph leaves its cell, so a whole frame can be blended at once
+        self.fits = True
+        for i, char in enumerate(chars):
+            left, top, right, bottom = font.getbbox(char)
+            pad_x, pad_y = max(0, -left) + self.cell[0], max(0, -top) + self.cell[1]
+            scratch = Image.new("L", (max(right, 0) + 2 * pad_x, max(bottom, 0) + 2 * pad_y))
+            ImageDraw.Draw(scratch).text((pad_x, pad_y), char, fill=255, font=font)
+            bbox = scratch.getbbox()
+            if bbox is None:
+                self.masks.append(None)
+                self.offsets.append((0, 0))
+                continue
+            mask = np.asarray(scratch.crop(bbox))
+            x, y = bbox[0] - pad_x, bbox[1] - pad_y
+            self.masks.append(mask)
+            self.offsets.append((x, y))
+            if x < 0 or y < 0 or x + mask.shape[1] > self.cell[0] or y + mask.shape[0] > self.cell[1]:
+                self.fits = False
+            else:
+                self.tiles[i, y:y+mask.shape[0], x:x+mask.shape[1]] = mask
+
 class ConverterConfig:
     """class contaning configuration for BaseConverter, and its subclasses.
 
@@ -35,7 +233,7 @@ class ConverterConfig:
     width: Optional[:class:`int`]
         width (in characters) of the output media. by default ``80``
     palette: Optional[List[Tuple[:class:`int`, :class:`int`, :class:`int`]]]
-        custom color palette, list of RGB tuples. by default ``None``
+        custom color palette, list of RGB tuples. palettes are compiled to a color lookup table on first use, tables for the built-in palettes are cached in ``~/.cache/asciipy`` (or ``$ASCIIPY_CACHE_DIR``). by default ``None``
     char_list: Optional[:class:`str`]
         custom character list (darkest -> brightest). by default ``gS#%@``
     font: Optional[:class:`os.PathLike` | :class:`io.IOBase` | :class:`str`]
@@ -44,14 +242,47 @@ class ConverterConfig:
         size of the font in points (font must support requested size). by default ``None``
     transparent: Optional[:class:`bool`]
         when true, the alpha channel from the input is preserved and applied to the output. otherwise the alpha channel is discarded. by default ``False``
+    cache: Optional[:class:`ConversionCache`]
+        when set, outputs are stored in this cache, and converting the same input with the same configuration copies the stored output instead. by default ``None``
+    progressive: Optional[:class:`bool`]
+        when true, urls are decoded and rendered while they are still downloading, instead of after the download finishes. progressive downloads are not looked up in the cache. by default ``False``
+    instrument: Optional[:class:`bool`]
+        when true, every conversion times its stages into :attr:`~asciipy.BaseConverter.stats`. by default ``False``
+    stats_callback: Optional[Callable[[:class:`str`, :class:`float`], Any]]
+        called with the stage name and seconds every time a stage finishes, implies ``instrument``. by default ``None``
+    text_mode: Optional[:class:`str`]
+        ``"plain"``, ``"ansi256"`` or ``"truecolor"`` to write the characters as text instead of rendering an image, with ansi color escapes in the last two.
+        the output can be a path or any stream, frames of gifs and videos are drawn over each other (separated by form feeds in plain text). by default ``None``
+    render_workers: Optional[:class:`int`]
+        number of threads a large image is rendered with, each drawing a band of rows into the same canvas. the output is identical to rendering with one thread.
+        fonts whose glyphs overlap neighbouring cells are always rendered with one thread. by default ``1``
+    reduced_decode: Optional[:class:`bool`]
+        when true, sources much larger than the output are decoded and resized at a reduced size: jpegs are decoded at a smaller dct scale, images are shrunk by an integer factor before they are resampled,
+        and video frames are area averaged before they are converted to images. time and memory then follow the size of the output instead of the source.
+        this is lossy: on typical images a third to most of the output pixels differ from a full size decode, usually by a few color levels, but cells near
+        a boundary switch to another character or palette color. leave it false for output identical to earlier versions. by default ``False``
+
+    Raises
+    ------
+    :class:`ValueError`
+        ``text_mode`` is not one of the supported modes.
     """
-    def __init__(self, *, width: int=80, palette: List[Tuple[int, int, int]]=None, char_list: str=None, font: Union[os.PathLike, IOBase, str]=None, font_size: int=None, transparent: bool=False) -> None:
+    def __init__(self, *, width: int=80, palette: List[Tuple[int, int, int]]=None, char_list: str=None, font: Union[os.PathLike, IOBase, str]=None, font_size: int=None, transparent: bool=False, cache: ConversionCache=None, progressive: bool=False, instrument: bool=False, stats_callback: Callable[[str, float], Any]=None, text_mode: str=None, render_workers: int=1, reduced_decode: bool=False) -> None:
+        if text_mode is not None and text_mode not in _text_modes:
+            raise ValueError(f"text_mode must be one of {', '.join(_text_modes)}, not {text_mode!r}")
         self.width = width
         self.palette = palette
         self.char_list = char_list
         self.font = font
         self.font_size = font_size
         self.transparent = transparent
+        self.cache = cache
+        self.progressive = progressive
+        self.instrument = instrument
+        self.stats_callback = stats_callback
+        self.text_mode = text_mode
+        self.render_workers = render_workers
+        self.reduced_decode = reduced_decode
 
 class BackgroundConfig:
     """class contanining configuration information for a converters background.
@@ -104,6 +335,22 @@ class BaseConverter:
         the converters font.
     transparent: :class:`bool`
         if the converter copies the inputs alpha channel.
+    cache: Optional[:class:`ConversionCache`]
+        cache outputs are stored in and copied from.
+    progressive: :class:`bool`
+        if urls are converted while they download.
+    instrument: :class:`bool`
+        if conversions time their stages.
+    stats: Optional[:class:`ConversionStats`]
+        timings and counts of the last conversion, ``None`` unless ``instrument`` is enabled.
+    media: Optional[:class:`MediaInfo`]
+        the probe result passed to the last conversion.
+    text_mode: Optional[:class:`str`]
+        the kind of text written instead of images, ``None`` for images.
+    render_workers: :class:`int`
+        number of threads an image is rendered with.
+    reduced_decode: :class:`bool`
+        if sources are decoded and resized at a reduced size.
     """
     def __init__(self, config: ConverterConfig=None, background: BackgroundConfig=None) -> None:
         if not isinstance(config, ConverterConfig):
@@ -116,20 +363,57 @@ class BaseConverter:
         self.font = config.font
         self.font_size = config.font_size
         self.transparent = config.transparent
+        self.cache: ConversionCache = config.cache
+        self._cache_key: str = None
+        self.progressive: bool = config.progressive
+        self._download: _Download = None
+        self._cancel: threading.Event = None
+        self.stats_callback: Callable[[str, float], Any] = config.stats_callback
+        self.instrument: bool = config.instrument or config.stats_callback is not None
+        self.stats: ConversionStats = None
+        self.media: MediaInfo = None
+        self.text_mode: str = config.text_mode
+        self.render_workers: int = max(config.render_workers or 1, 1)
+        self.reduced_decode: bool = config.reduced_decode
         if not isinstance(background, BackgroundConfig):
             background = BackgroundConfig(enabled=False)
         self._background = background
         self._mode = "RGBA" if self.transparent else "RGB"
+        self._atlas: _GlyphAtlas = None
+        self._atlas_key: Tuple[Any, ...] = None
+        self._canvases = _CanvasPool()
+        self.incremental: bool = False
+        self.cells_drawn: int = 0
+        self.cells_reused: int = 0
+        self._previous: Tuple[np.ndarray, Tuple[np.ndarray, ...]] = None
 
     def _process_input(self, _input: Any) -> Any:
+        self._download = None
         if isinstance(_input, str):
             check = urlcheck(_input)
             if check:
-                return f"./downloaded/{download(_input)}"
+                with self._stage("download"):
+                    if self.progressive:
+                        self._download = stream(_input)
+                        if self._download is not None:
+                            return self._progressive_input(self._download)
+                    return f"./downloaded/{download(_input)}"
             elif check == None:
                 raise requestsNotInstalled("requests is required to convert from urls, install it directly, or install asciipy-any[url]")
         return _input
         
+    def _stage(self, name: str) -> Any:
+        return _no_stage if self.stats is None else self.stats.stage(name)
+
+    def _progressive_input(self, download: _Download) -> Any:
+        # a file object that blocks at the end of the bytes downloaded so far, so PIL decodes as they arrive
+        return download.open()
+
+    def _close_input(self) -> None:
+        # the reader over a progressive download was opened by the converter, file objects passed in by the caller are left open
+        if self._download is not None and isinstance(self.input, IOBase):
+            self.input.close()
+
     def _get_color(self, col: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
         if self.palette != None:
             color_diffs = []
@@ -186,9 +470,269 @@ class BaseConverter:
             _col2 = x
         return _col2
 
-    def _process_image(self, img: Image.Image) -> Image.Image:
-        im = Image.new(mode=self._mode, size=(10000, 10000))
+    def _hooks_overridden(self) -> bool:
+        # subclasses (and monkeypatches) of the per-pixel hooks can't be vectorized, so they get the per-pixel renderer
+        for name, func in _pixel_hooks.items():
+            if name in vars(self) or getattr(type(self), name) is not func:
+                return True
+        return False
+
+    def _darken_array(self, rgb: np.ndarray) -> np.ndarray:
+        return _darken_hls(rgb, self._background.darken)
+
+    def _back_array(self, raw: np.ndarray) -> np.ndarray:
+        shape = raw.shape[:2]
+        if self._background.palette == None:
+            if self._background.alpha:
+                if self._background.color == None:
+                    back = self._darken_array(raw[..., :3])
+                    if self.transparent:
+                        back = np.dstack((back, raw[..., 3]))
+                elif len(self._background.color) == 3:
+                    back = np.dstack((np.broadcast_to(np.array(self._background.color, dtype=np.int32), shape + (3,)), raw[..., 3]))
+                else:
+                    back = np.broadcast_to(np.array(self._background.color, dtype=np.int32), shape + (len(self._background.color),))
+            elif self._background.color:
+                back = np.broadcast_to(np.array(self._background.color, dtype=np.int32), shape + (len(self._background.color),))
+            else:
+                back = self._darken_array(raw[..., :3])
+        else:
+            back = _nearest_color(raw[..., :3], self._background.palette)
+            if self._background.alpha and raw.shape[-1] > 3:
+                back = np.dstack((back, raw[..., 3]))
+        return back
+
+    def _process_grid(self, img: Image.Image) -> Tuple[np.ndarray, ...]:
+        """computes the character index, colors, and draw masks of every cell in ``img`` at once."""
+        with self._stage("color"):
+            raw = np.asarray(img).astype(np.int32)
+            if self.palette != None:
+                fore = _nearest_color(raw[..., :3], self.palette)
+                if self.transparent:
+                    fore = np.dstack((fore, raw[..., 3]))
+            else:
+                fore = raw
+            chars = _remap_array(fore[..., :3].sum(axis=-1), 0, 765, 0, len(self.chars)-1)
+            if fore.shape[-1] == 4:
+                fore_mask = fore[..., 3] > self._background.back_threshold
+            else:
+                fore_mask = np.ones(raw.shape[:2], dtype=bool)
+
+        back = back_mask = None
+        if self._background.enabled:
+            with self._stage("background"):
+                back = self._back_array(raw)
+                if back.shape[-1] == 4:
+                    back_mask = back[..., 3] > self._background.back_threshold
+                else:
+                    back_mask = np.ones(raw.shape[:2], dtype=bool)
+        return chars, fore, fore_mask, back, back_mask
+
+    def _glyph_atlas(self) -> _GlyphAtlas:
+        key = (self.font, self.font_size, self.chars)
+        if self._atlas is None or self._atlas_key != key:
+            from PIL import ImageFont
+            try:
+                font = ImageFont.truetype(self.font, self.font_size)
+            except AttributeError:
+                font = None
+            self._atlas = _GlyphAtlas(font, self.chars)
+            self._atlas_key = key
+        return self._atlas
+
+    def _compile_palettes(self) -> None:
+        for palette in (self.palette, self._background.palette):
+            if palette != None:
+                palettes._compile(palette)
+
+    def _changed_cells(self, grid: Tuple[np.ndarray, ...], canvas: np.ndarray) -> np.ndarray:
+        # cells whose glyph or colors differ from the previous frame, or None when the whole frame has to be drawn
+        if self._previous is None or self._previous[0] is not canvas:
+            return None
+        changed = np.zeros(grid[0].shape, dtype=bool)
+        for new, old in zip(grid, self._previous[1]):
+            if (new is None) != (old is None) or (new is not None and new.shape != old.shape):
+                return None
+            if new is not None:
+                difference = new != old
+                changed |= difference.any(axis=-1) if difference.ndim == 3 else difference
+        return changed
+
+    def _draw_cells(self, cells: np.ndarray, glyphs: np.ndarray, fore: np.ndarray, back: np.ndarray, back_mask: np.ndarray, pool: _CanvasPool=None) -> None:
+        # every argument is already broadcastable against cells, and colors are already converted to ink
+        bands = cells.shape[-1]
+        if back is not None and self._background.back_layer != None:
+            cells[...] = _ink_array(np.array(self._background.back_layer), bands)
+        else:
+            cells.fill(0)
+        if back is not None:
+            np.copyto(cells, back, where=back_mask, casting="unsafe")
+        _blend_glyphs(cells, glyphs, fore, pool)
+
+    def _draw_rows(self, cells: np.ndarray, atlas: _GlyphAtlas, grid: Tuple[np.ndarray, ...], rows: slice, pool: _CanvasPool) -> None:
+        # draws every cell in a band of rows, colors are already converted to ink
+        chars, fore, fore_mask, back, back_mask = (None if a is None else a[rows] for a in grid)
+        y_offset, x_offset = atlas.tiles.shape[1:]
+        glyphs = pool.get("glyphs", chars.shape + (y_offset, x_offset), np.uint8)
+        np.take(atlas.tiles, chars, axis=0, out=glyphs)
+        glyphs[~fore_mask] = 0
+        self._draw_cells(cells[rows], glyphs.transpose(0, 2, 1, 3), fore[:, None, :, None, :],
+                         None if back is None else back[:, None, :, None, :], None if back is None else back_mask[:, None, :, None, None], pool)
+
+    def _process_image(self, img: Image.Image, reuse: bool=False) -> Image.Image:
+        # with reuse the returned image is a pooled canvas, only valid until the next call
+        if self._hooks_overridden():
+            return self._process_pixels(img)
+        with self._stage("glyphs"):
+            rendered = self._render_grid(img)
+            if isinstance(rendered, np.ndarray):
+                size = (rendered.shape[1], rendered.shape[0])
+                if reuse:
+                    im = self._canvases.image(self._mode, size)
+                    im.frombytes(np.ascontiguousarray(rendered))
+                    return im
+                return Image.frombytes(self._mode, size, np.ascontiguousarray(rendered))
+            return rendered if reuse else rendered.copy()
+
+    def _render(self, img: Image.Image) -> Union[np.ndarray, Image.Image]:
+        # renders into a pooled canvas, returned as an array when the frame could be composed in bulk
+        if self._hooks_overridden():
+            return self._process_pixels(img)
+        with self._stage("glyphs"):
+            return self._render_grid(img)
+
+    def _render_grid(self, img: Image.Image) -> Union[np.ndarray, Image.Image]:
+        if self.stats is not None:
+            self.stats.count("frames")
+        atlas = self._glyph_atlas()
+        x_offset, y_offset = atlas.cell
+        chars, fore, fore_mask, back, back_mask = self._process_grid(img)
+        char_width, char_height = atlas.sizes[chars[-1, -1]]
+        width, height = (img.width * char_width, img.height * char_height)
+        bands = len(self._mode)
+
+        if atlas.fits and width <= img.width * x_offset and height <= img.height * y_offset:
+            canvas = self._canvases.get("canvas", (img.height * y_offset, img.width * x_offset, bands), np.uint8)
+            cells = canvas.reshape(img.height, y_offset, img.width, x_offset, bands)
+            fore = _ink_array(fore, bands)
+            if back is not None:
+                back = _ink_array(back, bands)
+            grid = (chars, fore, fore_mask, back, back_mask)
+            changed = self._changed_cells(grid, canvas) if self.incremental else None
+            if changed is None:
+                workers = min(self.render_workers, img.height // _min_band_rows)
+                if workers > 1:
+                    # cells don't overlap here, so bands of rows can be drawn at the same time without changing a single pixel
+                    from concurrent.futures import ThreadPoolExecutor
+                    edges = np.linspace(0, img.height, workers + 1).astype(int)
+                    with ThreadPoolExecutor(workers) as executor:
+                        list(executor.map(lambda band: self._draw_rows(cells, atlas, grid, slice(edges[band], edges[band + 1]), self._canvases.band(band)), range(workers)))
+                else:
+                    self._draw_rows(cells, atlas, grid, slice(0, img.height), self._canvases)
+                self.cells_drawn += chars.size
+            else:
+                ys, xs = np.nonzero(changed)
+                if len(ys):
+                    redrawn = cells[ys, :, xs]
+                    glyphs = atlas.tiles[chars[ys, xs]]
+                    glyphs[~fore_mask[ys, xs]] = 0
+                    self._draw_cells(redrawn, glyphs, fore[ys, xs][:, None, None, :],
+                                     None if back is None else back[ys, xs][:, None, None, :], None if back is None else back_mask[ys, xs][:, None, None, None])
+                    cells[ys, :, xs] = redrawn
+                self.cells_drawn += len(ys)
+                self.cells_reused += chars.size - len(ys)
+            if self.incremental:
+                self._previous = (canvas, tuple(None if a is None else a.copy() for a in grid))
+            return canvas[:height, :width]
+
+        self._previous = None
+        # glyphs overlap neighbouring cells, so they have to be pasted one at a time in drawing order
+        im = self._canvases.image(self._mode, (width, height))
+        im.paste(0, (0, 0, width, height))
+        from PIL import ImageDraw
         d = ImageDraw.Draw(im)
+        masks = [None if mask is None else Image.fromarray(mask, "L") for mask in atlas.masks]
+        chars = chars.tolist()
+        fore = [[tuple(col) for col in row] for row in fore.tolist()]
+        fore_mask = fore_mask.tolist()
+        if back is not None:
+            back = [[tuple(col) for col in row] for row in back.tolist()]
+            back_mask = back_mask.tolist()
+
+        for y in range(img.height):
+            _y = y * y_offset
+            for x in range(img.width):
+                _x = x * x_offset
+                if back is not None:
+                    if self._background.back_layer != None:
+                        d.rectangle((_x, _y, _x+x_offset, _y+y_offset), fill=(self._background.back_layer))
+                    if back_mask[y][x]:
+                        d.rectangle((_x, _y, (_x+x_offset)-1, (_y+y_offset)-1), fill=back[y][x])
+                char = chars[y][x]
+                if fore_mask[y][x] and masks[char] is not None:
+                    offset_x, offset_y = atlas.offsets[char]
+                    im.paste(fore[y][x], (_x+offset_x, _y+offset_y), masks[char])
+
+        return im
+
+    def _pixel_grid(self, img: Image.Image) -> Tuple[np.ndarray, ...]:
+        # the same arrays as _process_grid, from the per-pixel hooks
+        shape = (img.height, img.width)
+        chars = np.empty(shape, dtype=np.intp)
+        fore = np.zeros(shape + (4,), dtype=np.int32)
+        fore_mask = np.ones(shape, dtype=bool)
+        back = back_mask = None
+        if self._background.enabled:
+            back = np.zeros(shape + (4,), dtype=np.int32)
+            back_mask = np.ones(shape, dtype=bool)
+        for y in range(img.height):
+            for x in range(img.width):
+                raw_color = img.getpixel((x, y))
+                _col = self._get_color(raw_color)
+                chars[y, x] = _remap(_col[0] + _col[1] + _col[2], 0, 765, 0, len(self.chars)-1)
+                fore[y, x, :len(_col)] = _col
+                if len(_col) == 4:
+                    fore_mask[y, x] = _col[3] > self._background.back_threshold
+                if back is not None:
+                    _col2 = self._get_back_color(raw_color)
+                    back[y, x, :len(_col2)] = _col2
+                    if len(_col2) == 4:
+                        back_mask[y, x] = _col2[3] > self._background.back_threshold
+        return chars, fore, fore_mask, back, back_mask
+
+    def _process_text(self, img: Image.Image) -> str:
+        # the character grid as text, nothing is rasterized
+        if self.stats is not None:
+            self.stats.count("frames")
+        if self._hooks_overridden():
+            with self._stage("pixels"):
+                grid = self._pixel_grid(img)
+        else:
+            grid = self._process_grid(img)
+        with self._stage("text"):
+            back_layer = self._background.back_layer if grid[3] is not None else None
+            return _format_text(grid[0], self.chars, *grid[1:], back_layer=back_layer, mode=self.text_mode)
+
+    def _write_text(self, frames: Iterable[Image.Image], animated: bool, reporter: _ProgressReporter=None) -> None:
+        writer = _TextWriter(self.output, self.text_mode, animated)
+        try:
+            for img in frames:
+                text = self._process_text(img)
+                with self._stage("encode"):
+                    writer.write(text)
+                if reporter is not None:
+                    reporter.update()
+        finally:
+            writer.close()
+
+    def _process_pixels(self, img: Image.Image) -> Image.Image:
+        with self._stage("pixels"):
+            if self.stats is not None:
+                self.stats.count("frames")
+            return self._draw_pixels(img)
+
+    def _draw_pixels(self, img: Image.Image) -> Image.Image:
+        from PIL import ImageDraw, ImageFont
         _x = 0
         _y = 0
         try:
@@ -196,8 +740,13 @@ class BaseConverter:
         except AttributeError:
             font = None
 
-        x_offset = d.textsize(self.chars[-1], font=font)[0]
-        y_offset = d.textsize(self.chars[-1], font=font)[1]
+        # the output is sized by the last cells character, so it is looked up before drawing
+        atlas = self._glyph_atlas()
+        x_offset, y_offset = atlas.cell
+        last = self._get_color(img.getpixel((img.width-1, img.height-1)))
+        char_width, char_height = atlas.sizes[_remap(last[0] + last[1] + last[2], 0, 765, 0, len(self.chars)-1)]
+        im = Image.new(mode=self._mode, size=(img.width * char_width, img.height * char_height))
+        d = ImageDraw.Draw(im)
 
         for x in range(img.height):
             for i in range(img.width):
@@ -224,11 +773,57 @@ class BaseConverter:
                 _x += x_offset
             _y += y_offset
             _x = 0
-        width, height = (img.width * d.textsize(char, font=font)[0], img.height *  d.textsize(char, font=font)[1])
-        im = im.crop((0, 0, width, height))
         return im
 
-    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str]) -> None:
+    def _fingerprint(self) -> Dict[str, Any]:
+        # every setting that changes the output, subclasses add their own options
+        background = self._background
+        return {
+            "converter": f"{type(self).__module__}.{type(self).__qualname__}",
+            "version": __version__,
+            "width": self.width,
+            "palette": self.palette,
+            "chars": self.chars,
+            "font_size": self.font_size,
+            "transparent": self.transparent,
+            "background": {
+                "enabled": background.enabled,
+                "color": background.color,
+                "alpha": background.alpha,
+                "palette": background.palette,
+                "back_layer": background.back_layer,
+                "back_threshold": background.back_threshold,
+                "darken": background.darken,
+            },
+            "text_mode": self.text_mode,
+            "reduced_decode": self.reduced_decode,
+        }
+
+    def _cache_lookup(self) -> bool:
+        # overridden pixel hooks can't be fingerprinted, and outputs can only be stored from a path
+        self._cache_key = None
+        if self.cache is None or self._download is not None or not isinstance(self.output, (str, os.PathLike)) or self._hooks_overridden():
+            return False
+        source = _hash_source(self.input)
+        font = "" if self.font is None else _hash_source(self.font)
+        if font is None and isinstance(self.font, (str, os.PathLike)):
+            # a font name that truetype resolves from the system font directories
+            font = os.fspath(self.font)
+        if source is None or font is None:
+            return False
+        fingerprint = self._fingerprint()
+        fingerprint["font"] = font
+        fingerprint["format"] = os.path.splitext(os.fspath(self.output))[1].lower()
+        digest = hashlib.sha256(f"{source}:{json.dumps(fingerprint, sort_keys=True)}".encode()).hexdigest()
+        self._cache_key = digest + fingerprint["format"]
+        return self.cache.get(self._cache_key, self.output)
+
+    def _cache_store(self) -> None:
+        if self._cache_key is not None:
+            with self._stage("cache"):
+                self.cache.put(self._cache_key, self.output)
+
+    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str], *, media: MediaInfo=None) -> bool:
         """method to convert media, implemented by subclasses.
 
         Parameters
@@ -237,16 +832,113 @@ class BaseConverter:
             input media to convert.
         output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
             destination fron the output media.
+        media: Optional[:class:`MediaInfo`]
+            what :func:`probe` found out about the input, so it isn't rediscovered. by default ``None``
+
+        Returns
+        -------
+        :class:`bool`
+            true when the output was copied from :attr:`cache`, and the subclass has nothing left to convert.
 
         Raises
         ------
         :class:`NotImplementedError`
             method is only implemented in subclasses.
         """
-        self.input = self._process_input(_input)
-        self.output = output
         if type(self) == BaseConverter:
             raise NotImplementedError("method only implemented in subclasses.")
+        self._begin(_input, output, media)
+        with self._stage("cache"):
+            return self._cache_lookup()
+
+    def _begin(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str], media: MediaInfo) -> None:
+        # resets the state of the last conversion
+        self.stats = ConversionStats(self.stats_callback) if self.instrument else None
+        self.input = self._process_input(_input)
+        self.output = output
+        self.media = media
+        self.cells_drawn = 0
+        self.cells_reused = 0
+        self._previous = None
+
+    def _open_image(self) -> Image.Image:
+        # a probed format is the only decoder pillow tries, instead of testing the header against every plugin
+        formats = None
+        if self.media is not None and self.media.format is not None and self.media.kind != "video":
+            formats = [self.media.format.upper()]
+        return Image.open(self.input, formats=formats)
+
+    def _draft(self, img: Image.Image, size: Tuple[int, int]) -> None:
+        # formats that can decode at a reduced scale (jpeg) are told how small the image may get, before it is loaded
+        if self.reduced_decode:
+            img.draft(None, (size[0] * _reducing_gap, size[1] * _reducing_gap))
+
+    def _resize(self, img: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        if self.reduced_decode:
+            return img.resize(size, reducing_gap=_reducing_gap)
+        return img.resize(size)
+
+    def _check_cancelled(self) -> None:
+        if self._cancel is not None and self._cancel.is_set():
+            raise _Cancelled()
+
+    def _clone(self) -> "BaseConverter":
+        # a conversion keeps its state on the converter, so concurrent conversions each get their own copy
+        clone = copy.copy(self)
+        clone._canvases = _CanvasPool()
+        clone._previous = None
+        return clone
+
+    def _worker_copy(self) -> "BaseConverter":
+        # the copy handed to converter processes, without the parts that only work in this process (events, downloads, callbacks).
+        # spawned processes get it pickled, so those would fail to start them
+        worker = copy.copy(self)
+        worker._cancel = None
+        worker._download = None
+        worker.stats_callback = None
+        worker._previous = None
+        return worker
+
+    async def convert_async(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str], *, executor: "concurrent.futures.Executor"=None) -> ConversionStats:
+        """awaitable version of :meth:`convert`, the conversion runs in ``executor`` so the event loop is never blocked.
+        every call converts with its own copy of the converter, so one converter can run many conversions at once.
+        cancelling the awaiting task stops the conversion at the next frame, stops its converter processes and removes its temp files.
+
+        Parameters
+        ----------
+        input: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+            input media to convert.
+        output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+            destination fron the output media.
+        executor: Optional[:class:`concurrent.futures.Executor`]
+            thread based executor to run the conversion in. by default the event loops default executor
+
+        Returns
+        -------
+        Optional[:class:`ConversionStats`]
+            the conversions stats, when ``instrument`` is enabled.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        converter = self._clone()
+        converter._cancel = threading.Event()
+        future = loop.run_in_executor(executor, converter.convert, _input, output)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            converter._cancel.set()
+            # let the conversion reach a cancellation point and clean up before the cancellation is finished
+            await asyncio.wait([future])
+            if not future.cancelled():
+                future.exception()
+            raise
+        return converter.stats
+
+    @property
+    def hit_rate(self) -> float:
+        """fraction of cells copied from the previous frame instead of being redrawn during the last conversion, only non-zero when ``incremental`` is enabled."""
+        total = self.cells_drawn + self.cells_reused
+        return self.cells_reused / total if total else 0.0
 
     def on_image(self, frame: Union[os.PathLike, IOBase, str]) -> Any:
         """method called after an image or frame is converted and saved, implemented by subclasses or with :meth:`~asciipy.BaseConverter.image`.
@@ -270,6 +962,9 @@ class BaseConverter:
         self.on_image = func
 
 
+_pixel_hooks = {name: getattr(BaseConverter, name) for name in ("_get_color", "_get_back_color", "_darken_rgb")}
+
+
 class ImageConverter(BaseConverter):
     """converts images to ascii-images.
 
@@ -306,7 +1001,7 @@ class ImageConverter(BaseConverter):
             path to the saved image
         """
 
-    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str]) -> None:
+    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str], *, media: MediaInfo=None) -> None:
         """method to convert images to ascii-images.
 
         Parameters
@@ -315,18 +1010,42 @@ class ImageConverter(BaseConverter):
             input image to convert.
         output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
             destination fron the output image.
+        media: Optional[:class:`MediaInfo`]
+            what :func:`probe` found out about the input, so it isn't rediscovered. by default ``None``
             
         Returns
         -------
         None
         """
-        super().convert(_input, output)
-        img = Image.open(self.input).convert(self._mode)
-        aspect_ratio = img.width / img.height
-        height = int(self.width / (2 * aspect_ratio))
-        img = img.resize((self.width, height))
-        final = self._process_image(img)
-        final.save(self.output)
+        if super().convert(_input, output, media=media):
+            self.on_image(self.output)
+            return
+        try:
+            with self._stage("decode"):
+                img = self._open_image()
+                aspect_ratio = img.width / img.height
+                height = int(self.width / (2 * aspect_ratio))
+                self._draft(img, (self.width, height))
+                # converting after the resize only touches the small image, where that gives the same pixels
+                late = self.reduced_decode and (img.mode == self._mode or (img.mode in ("RGB", "L") and self._mode == "RGB"))
+                if late:
+                    img.load()
+                else:
+                    img = img.convert(self._mode)
+            self._check_cancelled()
+            with self._stage("resize"):
+                img = self._resize(img, (self.width, height))
+                if late:
+                    img = img.convert(self._mode)
+            if self.text_mode is not None:
+                self._write_text([img], False)
+            else:
+                final = self._process_image(img)
+                with self._stage("encode"):
+                    final.save(self.output)
+        finally:
+            self._close_input()
+        self._cache_store()
         self.on_image(self.output)
 
 
@@ -341,6 +1060,12 @@ class GifConverter(BaseConverter):
         configuration for the converters background. by default ``BackgroundConfig(enabled=False)``
     gif: Optional[:class:`bool`]
         when true, output all frames converted to ascii, otherwise output only the first frame. by default ``True``
+    incremental: Optional[:class:`bool`]
+        when true, only cells that changed since the previous frame are redrawn, see :attr:`~asciipy.BaseConverter.hit_rate`. by default ``False``
+    converters: Optional[:class:`int`]
+        number of converter processes to render frames with. by default ``1``
+    queue_size: Optional[:class:`int`]
+        maximum number of frames waiting for a converter process when ``converters > 1``. by default ``converters * 4``
 
     Attributes
     -----------
@@ -354,10 +1079,17 @@ class GifConverter(BaseConverter):
         the converters font.
     transparent: :class:`bool`
         if the converter copies the inputs alpha channel.
+    converters: :class:`int`
+        number of converter processes frames are rendered with.
+    queue_size: :class:`int`
+        maximum number of frames waiting for a converter process.
     """
-    def __init__(self, config: ConverterConfig=None, background: BackgroundConfig=None, *, gif: bool=True) -> None:
+    def __init__(self, config: ConverterConfig=None, background: BackgroundConfig=None, *, gif: bool=True, incremental: bool=False, converters: int=1, queue_size: int=None) -> None:
         super().__init__(config, background)
         self._gif = gif
+        self.incremental = incremental
+        self.converters: int = converters
+        self.queue_size: int = queue_size or converters * 4
 
     def on_image(self, frame: Union[os.PathLike, IOBase, str]) -> Any:
         """method called after a gif or image is converted and saved, implemented with :meth:`~asciipy.GifConverter.image`.
@@ -368,7 +1100,56 @@ class GifConverter(BaseConverter):
             path to the saved gif/image
         """
 
-    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str]) -> None:
+    def _fingerprint(self) -> Dict[str, Any]:
+        return {**super()._fingerprint(), "gif": self._gif}
+
+    def _read_frames(self, img: Image.Image) -> Iterator[Image.Image]:
+        # source frames are decoded one at a time as they are needed, instead of all of them before rendering starts
+        aspect_ratio = img.width / img.height
+        height = int(self.width / (2 * aspect_ratio))
+        index = 0
+        while True:
+            self._check_cancelled()
+            with self._stage("decode"):
+                try:
+                    img.seek(index)
+                except EOFError:
+                    return
+                frame = img.convert(self._mode)
+            with self._stage("resize"):
+                resized = self._resize(frame, (self.width, height))
+            if 'duration' in img.info:
+                resized.info['duration'] = img.info['duration']
+            index += 1
+            yield resized
+
+    def _render_frames(self, frames: Iterator[Image.Image]) -> Iterator[Image.Image]:
+        for frame in frames:
+            rendered = self._process_image(frame)
+            rendered.info = frame.info
+            yield rendered
+
+    def _render_pool(self, frames: Iterator[Image.Image]) -> Iterator[Image.Image]:
+        # at most `queue_size` frames are waiting on the pool at once, and they come back in order
+        self._glyph_atlas()
+        self._compile_palettes()
+        pending = deque()
+        import multiprocessing
+        with multiprocessing.Pool(self.converters, initializer=_init_pool, initargs=(self._worker_copy(),)) as pool:
+            for frame in chain(frames, [None]):
+                if frame is not None:
+                    pending.append((pool.apply_async(_render_pooled, (frame,)), frame.info))
+                while pending and (frame is None or len(pending) >= self.queue_size):
+                    result, info = pending.popleft()
+                    rendered, drawn, reused, stats = result.get()
+                    self.cells_drawn += drawn
+                    self.cells_reused += reused
+                    if stats is not None:
+                        self.stats._merge(stats)
+                    rendered.info = info
+                    yield rendered
+
+    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str], *, media: MediaInfo=None) -> None:
         """method to convert gifs to ascii-gifs (or images).
 
         Parameters
@@ -377,30 +1158,174 @@ class GifConverter(BaseConverter):
             input gif to convert.
         output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
             destination fron the output gif (or image).
+        media: Optional[:class:`MediaInfo`]
+            what :func:`probe` found out about the input, so it isn't rediscovered. by default ``None``
 
         Returns
         -------
         None
         """
-        super().convert(_input, output)
-        img = Image.open(self.input)
-        img.load()
-        aspect_ratio = img.width / img.height
-        height = int(self.width / (2 * aspect_ratio))
-        converted_frames: List[Image.Image] = []
-        frames = mimread(self.input)
-        # print is here so it doesn't falsely warn when using the default CLI
-        print('WARNING: gif conversion is not yet fully functional, please report any bugs at: https://github.com/anytarseir67/asciipy/issues/new')
-        for frame in frames:
-            frame = Image.fromarray(frame).convert(self._mode).resize((self.width, height))
-            converted_frames.append(self._process_image(frame))
+        if super().convert(_input, output, media=media):
+            self.on_image(self.output)
+            return
+        try:
+            img = self._open_image()
+            frames = self._read_frames(img)
+            if self.text_mode is not None:
+                try:
+                    self._write_text(frames if self._gif else islice(frames, 1), self._gif)
+                finally:
+                    frames.close()
+                    img.close()
+                self._cache_store()
+                self.on_image(self.output)
+                return
+            # print is here so it doesn't falsely warn when using the default CLI
+            print('WARNING: gif conversion is not yet fully functional, please report any bugs at: https://github.com/anytarseir67/asciipy/issues/new')
+            if self._gif and self.converters > 1:
+                converted_frames = self._render_pool(frames)
+            else:
+                converted_frames = self._render_frames(frames)
+
+            loop = img.info.get('loop') or 0
+            try:
+                first = next(converted_frames)
+                with self._stage("encode"):
+                    if self._gif:
+                        # every frame is already composited, so the source disposal doesn't apply to them.
+                        # transparent frames clear the last one, otherwise it would show through their transparent cells
+                        # pillow collects every frame before writing the first, so they are all held until the gif is written
+                        extra = {"disposal": 2} if self.transparent else {}
+                        first.save(self.output, save_all=True, append_images=converted_frames, loop=loop, **extra)
+                    else:
+                        first.save(self.output)
+            finally:
+                converted_frames.close()
+                img.close()
+            self._cache_store()
+            self.on_image(self.output)
+        finally:
+            self._close_input()
+
+
+_pool_converter: GifConverter = None
+
+def _init_pool(converter: GifConverter) -> None:
+    global _pool_converter
+    _pool_converter = converter
+    if converter.stats is not None:
+        # the callback runs in the parent, when the numbers are merged
+        converter.stats = ConversionStats()
+
+def _render_pooled(frame: Image.Image) -> Tuple[Image.Image, int, int, Tuple[Dict[str, float], Dict[str, int]]]:
+    drawn, reused = _pool_converter.cells_drawn, _pool_converter.cells_reused
+    rendered = _pool_converter._process_image(frame)
+    stats = None if _pool_converter.stats is None else _pool_converter.stats._drain()
+    return rendered, _pool_converter.cells_drawn - drawn, _pool_converter.cells_reused - reused, stats
+
 
-        loop = img.info.get('loop') or 0
-        if self._gif:
-            converted_frames.pop(0).save(self.output, save_all=True, append_images=converted_frames, loop=loop, duration=img.info['duration'])
+class _FrameRing:
+    """fixed size frame slots in shared memory, so frames move between processes without being pickled."""
+    def __init__(self, slots: int, slot_size: int, name: str=None) -> None:
+        self.slots = slots
+        self.slot_size = slot_size
+        from multiprocessing import shared_memory
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=max(1, slots * slot_size))
         else:
-            converted_frames[0].save(self.output)
-        self.on_image(self.output)
+            self._memory = shared_memory.SharedMemory(name=name)
+        self.name = self._memory.name
+
+    def view(self, slot: int, shape: Tuple[int, ...]) -> np.ndarray:
+        return np.ndarray(shape, dtype=np.uint8, buffer=self._memory.buf, offset=slot * self.slot_size)
+
+    def close(self, unlink: bool=False) -> None:
+        try:
+            self._memory.close()
+        except BufferError:
+            # a view is still alive somewhere, the mapping is released once it is collected
+            pass
+        if unlink:
+            self._memory.unlink()
+
+    def __getstate__(self) -> Tuple[str, int, int]:
+        return self.name, self.slots, self.slot_size
+
+    def __setstate__(self, state: Tuple[str, int, int]) -> None:
+        name, slots, slot_size = state
+        self.__init__(slots, slot_size, name)
+
+
+def _read_raw_frames(file: IOBase, size: Tuple[int, int]) -> Iterator[np.ndarray]:
+    # reads whole rgb24 frames, a partial frame at the end of the stream is dropped.
+    # every frame is read into the same buffer, it has to be copied before the next one is read
+    width, height = size
+    buffer = bytearray(width * height * 3)
+    view = memoryview(buffer)
+    frame = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+    while True:
+        filled = 0
+        while filled < len(buffer):
+            read = file.readinto(view[filled:])
+            if not read:
+                return
+            filled += read
+        yield frame
+
+
+class _RawFrameWriter:
+    """writes frames as raw rgb24 (or rgba) bytes of a fixed size to a binary stream."""
+    def __init__(self, file: IOBase, size: Tuple[int, int], flush: bool=False) -> None:
+        self.size = size
+        self._file = file
+        self._flush = flush
+
+    def write(self, frame: Union[Image.Image, np.ndarray]) -> None:
+        # output width follows the last cells glyph, so proportional fonts can change the frame size slightly
+        if isinstance(frame, Image.Image):
+            if frame.size != self.size:
+                frame = frame.crop((0, 0) + self.size)
+            self._file.write(frame.tobytes())
+        else:
+            if (frame.shape[1], frame.shape[0]) != self.size:
+                fitted = np.zeros((self.size[1], self.size[0], frame.shape[2]), dtype=np.uint8)
+                height, width = min(self.size[1], frame.shape[0]), min(self.size[0], frame.shape[1])
+                fitted[:height, :width] = frame[:height, :width]
+                frame = fitted
+            self._file.write(np.ascontiguousarray(frame))
+        if self._flush:
+            self._file.flush()
+
+    def finish(self) -> None:
+        self._file.flush()
+
+    def kill(self) -> None:
+        pass
+
+
+class _FFmpegStream(_RawFrameWriter):
+    """a single ffmpeg process that encodes raw frames from stdin, and muxes audio from the source in the same pass.
+    without a source the output has no audio."""
+    def __init__(self, source: Union[os.PathLike, str, None], output: Union[os.PathLike, str], size: Tuple[int, int], mode: str, fps: float, vcodec: str="libx264", flush: bool=False) -> None:
+        import subprocess
+        audio = [] if source is None else ['-i', str(source)]
+        mapping = ['-map', '0:v'] if source is None else ['-map', '0:v', '-map', '1:a?']
+        self._process = subprocess.Popen([
+            'ffmpeg', '-loglevel', 'quiet', '-hide_banner', '-nostats',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba' if mode == "RGBA" else 'rgb24', '-s', f'{size[0]}x{size[1]}', '-r', str(fps), '-i', 'pipe:0',
+            *audio, '-vcodec', vcodec, *mapping, '-y', str(output)
+        ], stdin=subprocess.PIPE)
+        super().__init__(self._process.stdin, size, flush)
+
+    def finish(self) -> None:
+        self._process.stdin.close()
+        code = self._process.wait()
+        if code != 0:
+            raise RuntimeError(f"ffmpeg exited with code {code}")
+
+    def kill(self) -> None:
+        self._process.kill()
+        self._process.wait()
 
 
 class VideoConverter(BaseConverter):
@@ -412,10 +1337,18 @@ class VideoConverter(BaseConverter):
         configuration for the converter. by default ``ConverterConfig()``
     background: Optional[:class:`BackgroundConfig`]
         configuration for the converters background. by default ``BackgroundConfig(enabled=False)``
-    progress: Optional[:class:`bool`]
-        when true, print the percentage completion after each frame. by default ``True``
+    progress: Optional[Union[:class:`bool`, Callable[[:class:`Progress`], Any], :class:`queue.Queue`]]
+        when true, print the percentage completion. a callable is called with a :class:`Progress`, and a queue gets them put into it instead, a full queue drops its oldest update. by default ``True``
+    progress_interval: Optional[:class:`float`]
+        minimum number of seconds between two progress updates, the last update is always delivered. by default ``0.1``
     converters: Optional[:class:`int`]
         number of converter processes to spawn. by default ``1``
+    stream: Optional[:class:`bool`]
+        when true, frames are piped straight into a single ffmpeg process instead of being saved as images first. :meth:`~asciipy.VideoConverter.on_image` is not called in this mode. by default ``False``
+    queue_size: Optional[:class:`int`]
+        maximum number of decoded frames waiting for a converter process, this bounds memory use when ``converters > 1``. by default ``converters * 4``
+    incremental: Optional[:class:`bool`]
+        when true, only cells that changed since the previous frame are redrawn, see :attr:`~asciipy.BaseConverter.hit_rate`. by default ``False``
 
     Attributes
     -----------
@@ -431,10 +1364,24 @@ class VideoConverter(BaseConverter):
         if the converter copies the inputs alpha channel.
     converters: :class:`int`
         number of converter processes what will be spawned when :meth:`~asciipy.VideoConverter.convert` is called.
+    stream: :class:`bool`
+        if frames are piped straight into ffmpeg.
+    queue_size: :class:`int`
+        maximum number of decoded frames waiting for a converter process.
+    incremental: :class:`bool`
+        if only changed cells are redrawn between frames.
+    progress: Union[:class:`bool`, Callable[[:class:`Progress`], Any], :class:`queue.Queue`]
+        where progress updates are delivered.
+    progress_interval: :class:`float`
+        minimum number of seconds between two progress updates.
     """
-    def __init__(self, config: ConverterConfig=None, background: BackgroundConfig=None, *, progress: bool=True, converters: int=1) -> None:
+    def __init__(self, config: ConverterConfig=None, background: BackgroundConfig=None, *, progress: Union[bool, Callable[[Progress], Any], queue.Queue]=True, progress_interval: float=0.1, converters: int=1, stream: bool=False, queue_size: int=None, incremental: bool=False) -> None:
         super().__init__(config, background)
-        self.progress: bool = progress
+        self.incremental = incremental
+        self.progress: Union[bool, Callable[[Progress], Any], queue.Queue] = progress
+        self.progress_interval: float = progress_interval
+        self.stream: bool = stream
+        self.queue_size: int = queue_size or converters * 4
         self.height: int = None
         self.fps: int = None
         self.converters: int = converters
@@ -463,24 +1410,260 @@ class VideoConverter(BaseConverter):
             path to the saved frame
         """
 
-    def _render_process(self, frames: List[Image.Image], num: int, count: "multiprocessing.Value[int]"=None) -> None:
+    def _fingerprint(self) -> Dict[str, Any]:
+        return {**super()._fingerprint(), "stream": self.stream}
+
+    def _progress_reporter(self, total_frames: float) -> Union[_ProgressReporter, None]:
+        if self.progress is False or self.progress is None:
+            return None
+        sink = _print_progress if self.progress is True else self.progress
+        return _ProgressReporter(sink, total_frames, self.progress_interval)
+
+    def iter_progress(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str]) -> Iterator[Progress]:
+        """converts a video in a background thread, yielding its progress as it goes.
+        the conversion runs with its own copy of the converter, and exceptions are raised from the generator once the updates run out.
+
+        Parameters
+        ----------
+        input: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+            input video to convert.
+        output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+            destination fron the output video.
+
+        Yields
+        ------
+        :class:`Progress`
+            an update at most every ``progress_interval`` seconds, the last one has ``done`` set.
+        """
+        updates = queue.SimpleQueue()
+        converter = self._clone()
+        converter.progress = updates
+        error = []
+        def run():
+            try:
+                converter.convert(_input, output)
+            except BaseException as e:
+                error.append(e)
+            finally:
+                updates.put(None)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        while True:
+            update = updates.get()
+            if update is None:
+                break
+            yield update
+        thread.join()
+        if error:
+            raise error[0]
+
+    def _open_capture(self) -> Tuple["cv2.VideoCapture", float]:
+        # opens the input, and returns it with its number of frames
+        import cv2
+        vid = cv2.VideoCapture(self.input)
+        if self._download is not None and not vid.isOpened():
+            # containers that can't be decoded without seeking have to wait for the whole file
+            vid = cv2.VideoCapture(self._download.wait())
+        self.fps = vid.get(cv2.CAP_PROP_FPS)
+        total_frames = vid.get(cv2.CAP_PROP_FRAME_COUNT)
+        if self.media is not None:
+            # opencv reports 0 for streams it can't seek in, like a progressive download
+            self.fps = self.fps or self.media.fps
+            total_frames = total_frames if total_frames > 0 else self.media.frames
+        return vid, total_frames
+
+    def _read_frames(self, vid: "cv2.VideoCapture") -> Iterator[Image.Image]:
+        i = 0
+        while(vid.isOpened()):
+            self._check_cancelled()
+            with self._stage("decode"):
+                img = vid.read()[1]
+            if img is None: break
+            yield self._frame_image(img, i == 0, bgr=True)
+            i += 1
+
+    def _frame_image(self, frame: np.ndarray, first: bool, bgr: bool=False) -> Image.Image:
+        # an rgb (or rgba, or grayscale) frame, or a bgr frame from opencv, resized to the output grid. the first frame decides the height
+        import cv2
+        if first:
+            aspect_ratio = frame.shape[1] / frame.shape[0]
+            self.height = int(self.width / (2 * aspect_ratio))
+        if self.reduced_decode and frame.shape[1] >= self.width and frame.shape[0] >= self.height:
+            # the frame is area averaged down to the grid while it is still an array, everything after only touches the small frame
+            with self._stage("resize"):
+                frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+            with self._stage("decode"):
+                if bgr:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                return Image.fromarray(frame).convert(self._mode)
+        with self._stage("decode"):
+            if bgr:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            img = Image.fromarray(frame)
+            img = img.convert(self._mode)
+        with self._stage("resize"):
+            return img.resize((self.width, self.height))
+
+    def _render_process(self, tasks: "multiprocessing.Queue", results: "multiprocessing.Queue", frames: "_FrameRing", rendered: "_FrameRing") -> None:
+        # renders frames until a None task arrives, then reports it is done with a None result
+        if self.stats is not None:
+            # the callback runs in the parent, when the numbers are merged
+            self.stats = ConversionStats()
         try:
-            for frame in frames:
-                _ascii = self._process_image(frame)
-                _ascii.save(f'./frames_{self._id}/img{num}.png')
-                num += 1
-                if count:
-                    with count.get_lock():
-                        count.value += 1
+            self._render_slots(tasks, results, frames, rendered)
         except KeyboardInterrupt:
             return
+        finally:
+            frames.close()
+            if rendered is not None:
+                rendered.close()
+        results.put(None)
+
+    def _render_slots(self, tasks: "multiprocessing.Queue", results: "multiprocessing.Queue", frames: "_FrameRing", rendered: "_FrameRing") -> None:
+        failed = False
+        shape = (self.height, self.width, len(self._mode))
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            if failed:
+                # keep consuming so every slot is handed back to the main process
+                continue
+            num, slot = task
+            drawn, reused = self.cells_drawn, self.cells_reused
+            try:
+                img = Image.fromarray(frames.view(slot, shape), self._mode)
+                if rendered is not None:
+                    frame = self._render(img)
+                    if not isinstance(frame, np.ndarray):
+                        frame = np.asarray(frame)
+                    np.copyto(rendered.view(slot, frame.shape), frame)
+                    size = frame.shape
+                else:
+                    frame = self._process_image(img, reuse=True)
+                    with self._stage("encode"):
+                        frame.save(f'./frames_{self._id}/img{num}.png')
+                    size = None
+                stats = None if self.stats is None else self.stats._drain()
+                results.put((num, slot, size, (self.cells_drawn - drawn, self.cells_reused - reused, stats)))
+            except Exception:
+                failed = True
+                results.put((-1, slot, traceback.format_exc(), None))
+
+    def _write_results(self, results: "multiprocessing.Queue", free: queue.Queue, rendered: "_FrameRing", writer: "_FFmpegStream", state: Dict[str, Any]) -> None:
+        # runs in a thread of the main process, writing rendered frames in order and handing their slots back to the decoder
+        pending = {}
+        following = 0
+        finished = 0
+        while finished < self.converters:
+            try:
+                result = results.get(timeout=1)
+            except queue.Empty:
+                if not any(p.is_alive() for p in state['processes']):
+                    state['error'] = state['error'] or "converter processes exited unexpectedly."
+                    return
+                continue
+            if result is None:
+                finished += 1
+                continue
+            num, slot, shape, cells = result
+            if num == -1:
+                state['error'] = shape
+                free.put(slot)
+                continue
+            if state['error'] is not None:
+                free.put(slot)
+                continue
+            self.cells_drawn += cells[0]
+            self.cells_reused += cells[1]
+            if cells[2] is not None:
+                self.stats._merge(cells[2])
+            if writer is None:
+                free.put(slot)
+            pending[num] = (slot, shape)
+            try:
+                while following in pending:
+                    slot, shape = pending.pop(following)
+                    if writer is not None:
+                        with self._stage("encode"):
+                            writer.write(rendered.view(slot, shape))
+                        free.put(slot)
+                    following += 1
+                    if state['reporter'] is not None:
+                        state['reporter'].update()
+            except Exception:
+                state['error'] = traceback.format_exc()
+                for slot, shape in pending.values():
+                    free.put(slot)
+                pending.clear()
 
     @staticmethod
-    def _chunk(it: list, size: int) -> ...:
-        it = iter(it)
-        return iter(lambda: tuple(islice(it, size)), ())
+    def _take_slot(free: queue.Queue, collector: threading.Thread) -> int:
+        # blocks until a slot is free, unless the pipeline has already stopped
+        while collector.is_alive():
+            try:
+                return free.get(timeout=1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _render_pipeline(self, frames: Iterator[Image.Image], reporter: _ProgressReporter, writer: "_FFmpegStream") -> None:
+        # the main process decodes into a bounded set of shared memory slots, converter processes render,
+        # and a thread reassembles the output in order
+        atlas = self._glyph_atlas()
+        self._compile_palettes()
+        bands = len(self._mode)
+        shape = (self.height, self.width, bands)
+        frame_ring = _FrameRing(self.queue_size, self.height * self.width * bands)
+        rendered_ring = None
+        if writer is not None:
+            # the output size depends on the glyph of the last cell, so slots fit the largest glyph
+            width = self.width * max(size[0] for size in atlas.sizes + [atlas.cell])
+            height = self.height * max(size[1] for size in atlas.sizes + [atlas.cell])
+            rendered_ring = _FrameRing(self.queue_size, width * height * bands)
+        import multiprocessing
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        free = queue.Queue()
+        for slot in range(self.queue_size):
+            free.put(slot)
+        worker = self._worker_copy()
+        processes = [multiprocessing.Process(target=worker._render_process, args=(tasks, results, frame_ring, rendered_ring), daemon=True) for _ in range(self.converters)]
+        try:
+            for p in processes:
+                p.start()
+            state = {'reporter': reporter, 'error': None, 'processes': processes}
+            collector = threading.Thread(target=self._write_results, args=(results, free, rendered_ring, writer, state), daemon=True)
+            collector.start()
+            for num, img in enumerate(frames):
+                if state['error'] is not None:
+                    break
+                slot = self._take_slot(free, collector)
+                if slot is None:
+                    break
+                np.copyto(frame_ring.view(slot, shape), np.asarray(img))
+                tasks.put((num, slot))
+            for _ in processes:
+                tasks.put(None)
+            collector.join()
+            for p in processes:
+                p.join()
+        except BaseException:
+            # processes after the one that failed to start were never started, and can't be terminated
+            started = [p for p in processes if p.pid is not None]
+            for p in started:
+                p.terminate()
+            for p in started:
+                p.join()
+            raise
+        finally:
+            frame_ring.close(unlink=True)
+            if rendered_ring is not None:
+                rendered_ring.close(unlink=True)
+        if state['error'] is not None:
+            raise RuntimeError(f"a converter process failed:\n{state['error']}")
 
-    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str]) -> None:
+    def convert(self, _input: Union[os.PathLike, IOBase, str], output: Union[os.PathLike, IOBase, str], *, media: MediaInfo=None) -> None:
         """method to convert videos to ascii-videos.
 
         Parameters
@@ -489,90 +1672,451 @@ class VideoConverter(BaseConverter):
             input video to convert.
         output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
             destination fron the output video.
+        media: Optional[:class:`MediaInfo`]
+            what :func:`probe` found out about the input, so it isn't rediscovered. by default ``None``
 
         Returns
         -------
         None
         """
-        super().convert(_input, output)
+        if super().convert(_input, output, media=media):
+            print("conversion loaded from cache.")
+            return
         start = datetime.now()
+        writer = None
         try:
-            os.mkdir(f'./frames_{self._id}')
-            vid = cv2.VideoCapture(self.input)
-            self.fps = vid.get(cv2.CAP_PROP_FPS)
-            total_frames = vid.get(cv2.CAP_PROP_FRAME_COUNT)
-            i = 0
-            frames = []
-            while(vid.isOpened()):  
-                img = vid.read()[1]
-                if img is None: break
-                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(img)
-                img = img.convert(self._mode)
-                if i == 0:
-                    aspect_ratio = img.width / img.height
-                    self.height = int(self.width / (2 * aspect_ratio))
-                img = img.resize((self.width, self.height))
-                if self.converters == 1:
-                    frame = self._process_image(img)
-                    frame.save(f'./frames_{self._id}/img{i}.png')
-                    if self.progress:
-                        self.on_image(f'./frames_{self._id}/img{i}.png')
-                else:
-                    frames.append(img)
-                i+=1
-                if self.progress:
-                    print(f"\rloading video... {round((i/total_frames)*100)}% complete. ", end='')
-            if self.progress:
-                print('\n')
-            if self.converters > 1:
+            if not self.stream and self.text_mode is None:
+                os.mkdir(f'./frames_{self._id}')
+            vid, total_frames = self._open_capture()
+            reporter = self._progress_reporter(total_frames)
+            frames = self._read_frames(vid)
+            if self.text_mode is not None:
+                # text is cheap enough to write from this process, converters are not used
+                self._write_text(frames, True, reporter)
+            elif self.converters > 1:
                 print("WARNING: multiprocess conversion is not yet finished, please report any bugs at: https://github.com/anytarseir67/asciipy/issues/new")
-                count = multiprocessing.Value('i', 0) if self.progress == True else None
-                chunk_len = round(len(frames)/self.converters)
-                chunks = list(self._chunk(frames, chunk_len))
-                cur = 0
-                processes = []
-                for chunk in chunks:
-                    p = multiprocessing.Process(target=self._render_process, args=(chunk, cur, count,))
-                    p.start()
-                    processes.append(p)
-                    cur += chunk_len
-
-                while all([p.is_alive() for p in processes]):
-                    if self.progress:
-                        with count.get_lock():
-                            print(f"\r{round((count.value/total_frames)*100)}% complete. ", end='')
-                if self.progress:
-                    print('\n')
-
-                for p in processes:
-                    p.join()
-
-            self._combine()
+                first = next(frames, None)
+                if first is not None:
+                    if self.stream:
+                        writer = self._open_stream(self._process_image(first, reuse=True).size)
+                    self._render_pipeline(chain([first], frames), reporter, writer)
+            else:
+                for i, img in enumerate(frames):
+                    frame = self._process_image(img, reuse=True)
+                    if self.stream:
+                        if writer is None:
+                            writer = self._open_stream(frame.size)
+                        with self._stage("encode"):
+                            writer.write(frame)
+                    else:
+                        with self._stage("encode"):
+                            frame.save(f'./frames_{self._id}/img{i}.png')
+                        if self.progress:
+                            self.on_image(f'./frames_{self._id}/img{i}.png')
+                    if reporter is not None:
+                        reporter.update()
+            if reporter is not None:
+                reporter.finish()
+
+            if self.stream:
+                if writer is not None:
+                    with self._stage("mux"):
+                        writer.finish()
+                        writer = None
+                        if self._download is not None:
+                            self._mux_audio()
+            elif self.text_mode is None:
+                self._check_cancelled()
+                with self._stage("mux"):
+                    self._combine()
+            self._cache_store()
         except KeyboardInterrupt:
-            for p in processes:
-                p.terminate()
-
             print('conversion interupted.')
         except Exception as e:
             raise e
         else:
             print(f"conversion completed after {datetime.now() - start}")
         finally:
+            if writer is not None:
+                writer.kill()
             print('clearing temp files...')
             self._clear()
 
+    def play(self, _input: Union[os.PathLike, IOBase, str], output: Union[IOBase, Any]=None, *, text_mode: str=None, media: MediaInfo=None) -> int:
+        """plays a video as text at its own frame rate, every frame is drawn over the last one from the top left corner.
+        frames that are already late are skipped without being decoded, so playback keeps up with the video instead of falling behind.
+        nothing is saved and ffmpeg isn't used, the video plays without sound.
+
+        Parameters
+        ----------
+        input: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+            input video to play.
+        output: Optional[:class:`io.IOBase`]
+            stream the frames are written to. by default ``sys.stdout``
+        text_mode: Optional[:class:`str`]
+            the kind of text to play, see :class:`ConverterConfig`. by default :attr:`text_mode`, or ``"truecolor"`` when that isn't set.
+        media: Optional[:class:`MediaInfo`]
+            what :func:`probe` found out about the input, so it isn't rediscovered. by default ``None``
+
+        Returns
+        -------
+        :class:`int`
+            number of frames that were skipped.
+
+        Raises
+        ------
+        :class:`ValueError`
+            ``text_mode`` is not one of the supported modes.
+        """
+        text_mode = text_mode or self.text_mode or "truecolor"
+        if text_mode not in _text_modes:
+            raise ValueError(f"text_mode must be one of {', '.join(_text_modes)}, not {text_mode!r}")
+        import sys
+        from time import perf_counter, sleep
+        self._begin(_input, sys.stdout if output is None else output, media)
+        configured, self.text_mode = self.text_mode, text_mode
+        writer = _TextWriter(self.output, text_mode, animated=True, redraw=True)
+        dropped = 0
+        try:
+            vid, _ = self._open_capture()
+            interval = 1 / self.fps if self.fps and self.fps > 0 else 0.0
+            start = perf_counter()
+            # index of the next frame in the video, frame i is due ``i * interval`` seconds after the start
+            index = 0
+            while vid.isOpened():
+                self._check_cancelled()
+                now = perf_counter() - start
+                late = int(now / interval) - index if interval else 0
+                if late > 0:
+                    # the frames whose time has passed are only grabbed, decoding them is the expensive part
+                    with self._stage("decode"):
+                        skipped = 0
+                        while skipped < late and vid.grab():
+                            skipped += 1
+                    index += skipped
+                    dropped += skipped
+                    if self.stats is not None:
+                        self.stats.count("dropped", skipped)
+                    if skipped < late:
+                        break
+                elif index * interval > now:
+                    sleep(index * interval - now)
+                with self._stage("decode"):
+                    frame = vid.read()[1]
+                if frame is None:
+                    break
+                text = self._process_text(self._frame_image(frame, writer.frames == 0, bgr=True))
+                with self._stage("encode"):
+                    writer.write(text)
+                index += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.text_mode = configured
+            writer.close()
+            self._clear()
+        return dropped
+
+    def frame_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """size of the frames :meth:`convert_frames` writes for input frames of ``size``.
+
+        Parameters
+        ----------
+        size: Tuple[:class:`int`, :class:`int`]
+            width and height of the input frames.
+
+        Returns
+        -------
+        Tuple[:class:`int`, :class:`int`]
+            width and height of the converted frames in pixels.
+        """
+        x_offset, y_offset = self._glyph_atlas().cell
+        return self.width * x_offset, int(self.width / (2 * (size[0] / size[1]))) * y_offset
+
+    def convert_frames(self, source: Union[IOBase, os.PathLike, str, Iterable[np.ndarray]], output: Union[os.PathLike, IOBase, str], *, size: Tuple[int, int]=None, fps: float=30.0) -> int:
+        """converts a live stream of raw frames, every frame is written to the output (and flushed) as soon as it is converted, without any intermediate files.
+
+        Parameters
+        ----------
+        source: Union[:class:`io.IOBase`, :class:`os.PathLike`, :class:`str`, Iterable[:class:`numpy.ndarray`]]
+            raw rgb24 frames of ``size`` back to back, from a binary stream like ``sys.stdin.buffer`` or a pipe, or from the path of a fifo or file.
+            an iterable of ``(height, width, 3)`` uint8 arrays (or rgba, or grayscale) is converted as it is.
+        output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+            with :attr:`text_mode` set, the text of every frame is written to a path or stream.
+            otherwise a path is encoded by ffmpeg (without audio), and a binary stream gets the converted frames as raw rgb24 (rgba when transparent) bytes, each of :meth:`frame_size`.
+        size: Optional[Tuple[:class:`int`, :class:`int`]]
+            width and height of the raw frames, only optional for arrays.
+        fps: Optional[:class:`float`]
+            frame rate of the source, used when encoding to a path. by default ``30.0``
+
+        Returns
+        -------
+        :class:`int`
+            number of frames converted.
+
+        Raises
+        ------
+        :class:`ValueError`
+            ``size`` is missing for a stream or path source.
+        """
+        is_stream = hasattr(source, "read") or hasattr(source, "buffer") or isinstance(source, (str, os.PathLike))
+        if is_stream and size is None:
+            raise ValueError("the size of raw frames has to be given")
+        self._begin(None, output, None)
+        self.fps = fps
+        if isinstance(source, (str, os.PathLike)):
+            source = open(source, "rb")
+            owned = source
+        else:
+            owned = None
+        frames = _read_raw_frames(getattr(source, "buffer", source), size) if is_stream else iter(source)
+        # printed progress would end up between the frames of a stream
+        reporter = self._progress_reporter(None) if isinstance(output, (str, os.PathLike)) or self.progress is not True else None
+        writer = None
+        count = 0
+        try:
+            if self.text_mode is not None:
+                writer = _TextWriter(output, self.text_mode, animated=True)
+            for frame in frames:
+                self._check_cancelled()
+                img = self._frame_image(frame, count == 0)
+                if self.text_mode is not None:
+                    text = self._process_text(img)
+                    with self._stage("encode"):
+                        writer.write(text)
+                else:
+                    image = self._process_image(img, reuse=True)
+                    if writer is None:
+                        frame_size = self.frame_size((frame.shape[1], frame.shape[0]))
+                        if isinstance(output, (str, os.PathLike)):
+                            writer = _FFmpegStream(None, output, frame_size, self._mode, fps, flush=True)
+                        else:
+                            writer = _RawFrameWriter(getattr(output, "buffer", output), frame_size, flush=True)
+                    with self._stage("encode"):
+                        writer.write(image)
+                count += 1
+                if reporter is not None:
+                    reporter.update()
+            if reporter is not None:
+                reporter.finish()
+            if isinstance(writer, _TextWriter):
+                writer.close()
+            elif writer is not None:
+                with self._stage("mux"):
+                    writer.finish()
+            writer = None
+        finally:
+            if isinstance(writer, _TextWriter):
+                writer.close()
+            elif writer is not None:
+                writer.kill()
+            if owned is not None:
+                owned.close()
+        return count
+
+    def _progressive_input(self, download: _Download) -> Any:
+        # opencv can only open paths, so the download is fed to it through a fifo
+        return download.pipe()
+
+    def _audio_source(self) -> Union[os.PathLike, str]:
+        # audio is muxed from the source file, a progressive download has to finish first
+        if self._download is not None:
+            return self._download.wait()
+        return self.input
+
+    def _worker_copy(self) -> "VideoConverter":
+        worker = super()._worker_copy()
+        # progress is reported from this process, and may be a callable or queue that can't be pickled
+        worker.progress = False
+        return worker
+
+    def _clone(self) -> "VideoConverter":
+        clone = super()._clone()
+        clone._id = randint(0, 999999)
+        return clone
+
+    def _open_stream(self, size: Tuple[int, int]) -> "_FFmpegStream":
+        # ffmpeg muxes the audio from the source while frames are being rendered. a progressive download is still growing,
+        # so its frames are encoded without audio, and the audio is muxed from the local file once it is complete
+        if self._download is not None:
+            return _FFmpegStream(None, f'./video_{self._id}.mp4', size, self._mode, self.fps)
+        return _FFmpegStream(self.input, self.output, size, self._mode, self.fps)
+
+    def _mux_audio(self) -> None:
+        import subprocess
+        code = subprocess.call([
+            'ffmpeg', '-loglevel', 'quiet', '-hide_banner', '-nostats',
+            '-i', f'./video_{self._id}.mp4', '-i', str(self._audio_source()), '-c:v', 'copy', '-map', '0:v', '-map', '1:a?', '-y', str(self.output)
+        ])
+        if code != 0:
+            raise RuntimeError(f"ffmpeg exited with code {code}")
+
     def _combine(self) -> None:
         vcodec = "libx264" # will be changable later, just messing around with it for now.
-        os.system(f'ffmpeg -loglevel quiet -hide_banner -nostats -r {self.fps} -i ./frames_{self._id}/img%01d.png -vcodec {vcodec} -y temp.mp4')
-        os.system(f'ffmpeg -loglevel quiet -hide_banner -nostats -i temp.mp4 -i "{self.input}" -vcodec {vcodec} -map 0:v -map 1:a? -y {self.output}')
+        os.system(f'ffmpeg -loglevel quiet -hide_banner -nostats -r {self.fps} -i ./frames_{self._id}/img%01d.png -vcodec {vcodec} -y ./frames_{self._id}/temp.mp4')
+        os.system(f'ffmpeg -loglevel quiet -hide_banner -nostats -i ./frames_{self._id}/temp.mp4 -i "{self._audio_source()}" -vcodec {vcodec} -map 0:v -map 1:a? -y {self.output}')
 
     def _clear(self) -> None:
+        if self._download is not None and self.input != self._download.path:
+            _Download.release(self.input)
+        for f in glob.glob(f'./frames_{self._id}/*') + glob.glob(f'./video_{self._id}.mp4'):
+            os.remove(f)
         try:
-            os.remove('./temp.mp4')
+            os.rmdir(f'./frames_{self._id}')
         except FileNotFoundError:
             pass
-        for f in glob.glob(f'./frames_{self._id}/*'):
-            os.remove(f)
-        os.rmdir(f'./frames_{self._id}')
-        
\ No newline at end of file
+        
+
+class BatchResult:
+    """the outcome of converting a single file with :class:`~asciipy.BatchConverter`.
+
+    Attributes
+    -----------
+    input: :class:`str`
+        path of the converted file.
+    output: :class:`str`
+        path the output was written to.
+    error: Optional[:class:`str`]
+        traceback of the exception raised while converting, ``None`` when the conversion succeeded.
+    """
+    def __init__(self, input: str, output: str, error: str=None) -> None:
+        self.input = input
+        self.output = output
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """if the file was converted without an error."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"<BatchResult input={self.input!r} output={self.output!r} ok={self.ok}>"
+
+
+_batch_converter: BaseConverter = None
+
+def _init_batch(converter: BaseConverter) -> None:
+    global _batch_converter
+    _batch_converter = converter
+    # load the font and palettes once per process, instead of once per file
+    converter._glyph_atlas()
+    converter._compile_palettes()
+
+def _convert_batched(paths: Tuple[str, str]) -> BatchResult:
+    _input, output = paths
+    try:
+        # every file gets its own copy, a video converter names its temp files after the copy it converts with
+        _batch_converter._clone().convert(_input, output)
+    except Exception:
+        return BatchResult(_input, output, traceback.format_exc())
+    return BatchResult(_input, output)
+
+def _batch_outputs(files: List[str], output: str) -> List[str]:
+    # outputs keep their path below the directory every input shares, so inputs with the same name in different directories don't collide
+    paths = [os.path.abspath(f) for f in files]
+    try:
+        root = os.path.commonpath([os.path.dirname(f) for f in paths])
+    except ValueError:
+        # inputs on different drives
+        return [os.path.join(output, os.path.basename(f)) for f in files]
+    return [os.path.join(output, os.path.relpath(f, root)) for f in paths]
+
+
+class BatchConverter:
+    """converts many files with a pool of converter processes that is kept alive between calls.
+    the pool is started on first use, and can be reused by calling :meth:`~asciipy.BatchConverter.convert` multiple times,
+    or by using the batch converter as a context manager.
+
+    Parameters
+    ----------
+    converter: Optional[:class:`BaseConverter`]
+        converter every file is converted with, each process keeps its own copy. by default ``ImageConverter()``
+    processes: Optional[:class:`int`]
+        number of converter processes to spawn. by default ``os.cpu_count()``
+
+    Attributes
+    -----------
+    converter: :class:`BaseConverter`
+        converter every file is converted with.
+    processes: :class:`int`
+        number of converter processes.
+    """
+    def __init__(self, converter: BaseConverter=None, *, processes: int=None) -> None:
+        self.converter: BaseConverter = converter or ImageConverter()
+        self.processes: int = processes or os.cpu_count() or 1
+        self._pool: "multiprocessing.pool.Pool" = None
+
+    def __enter__(self) -> "BatchConverter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def expand(paths: Union[Iterable[Union[os.PathLike, str]], os.PathLike, str]) -> List[str]:
+        """expands directories and glob patterns into the files they contain.
+
+        Parameters
+        ----------
+        paths: Union[Iterable[Union[:class:`os.PathLike`, :class:`str`]], :class:`os.PathLike`, :class:`str`]
+            files, directories (not searched recursively) or glob patterns.
+
+        Returns
+        -------
+        List[:class:`str`]
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        files = []
+        for path in map(os.fspath, paths):
+            if os.path.isdir(path):
+                files.extend(sorted(f for f in glob.glob(os.path.join(glob.escape(path), '*')) if os.path.isfile(f)))
+            elif glob.has_magic(path):
+                files.extend(sorted(f for f in glob.glob(path, recursive=True) if os.path.isfile(f)))
+            else:
+                files.append(path)
+        return files
+
+    def convert(self, inputs: Union[Iterable[Union[os.PathLike, str]], os.PathLike, str], output: Union[os.PathLike, str]) -> List[BatchResult]:
+        """converts every input into the output directory, under its path below the directory all inputs are in
+        (``a/x.png`` and ``b/x.png`` are written to ``output/a/x.png`` and ``output/b/x.png``, the files of a single directory directly into ``output``).
+        a file that fails to convert does not stop the rest of the batch, its error is reported in the returned results.
+        so is an input whose output another input already writes to, like the same file listed twice.
+
+        Parameters
+        ----------
+        inputs: Union[Iterable[Union[:class:`os.PathLike`, :class:`str`]], :class:`os.PathLike`, :class:`str`]
+            files, directories or glob patterns to convert, see :meth:`~asciipy.BatchConverter.expand`.
+        output: Union[:class:`os.PathLike`, :class:`str`]
+            directory the outputs are written to, created if it does not exist.
+
+        Returns
+        -------
+        List[:class:`BatchResult`]
+            one result per input file, in the same order as the inputs.
+        """
+        output = os.fspath(output)
+        files = self.expand(inputs)
+        tasks, results, seen = [], [], {}
+        for f, out in zip(files, _batch_outputs(files, output)):
+            key = os.path.normcase(out)
+            if key in seen:
+                results.append(BatchResult(f, out, f"{out} is already the output of {seen[key]}"))
+                continue
+            seen[key] = f
+            os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+            tasks.append((f, out))
+            results.append(None)
+        os.makedirs(output, exist_ok=True)
+        if self._pool is None:
+            import multiprocessing
+            self._pool = multiprocessing.Pool(self.processes, initializer=_init_batch, initargs=(self.converter._worker_copy(),))
+        converted = iter(self._pool.map(_convert_batched, tasks, chunksize=max(1, len(tasks) // (self.processes * 4))))
+        return [result or next(converted) for result in results]
+
+    def close(self) -> None:
+        """stops the converter processes, the pool is started again if the batch converter is used afterwards."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -0,0 +1,131 @@
+import os
+import shutil
+from io import IOBase
+
+from typing import Union
+
+from .palettes import _cache_dir
+
+
+class ConversionCache:
+    """local on-disk store of converted outputs, keyed by a hash of the input together with the converters configuration.
+    when the store grows past ``max_size``, the least recently used outputs are removed.
+
+    Parameters
+    ----------
+    path: Optional[Union[:class:`os.PathLike`, :class:`str`]]
+        directory the outputs are stored in. by default ``~/.cache/asciipy/conversions`` (or ``$ASCIIPY_CACHE_DIR/conversions``)
+    max_size: Optional[:class:`int`]
+        maximum total size of the stored outputs in bytes. by default ``1073741824`` (1 GiB)
+
+    Attributes
+    -----------
+    path: :class:`str`
+        directory the outputs are stored in.
+    max_size: :class:`int`
+        maximum total size of the stored outputs in bytes.
+    hits: :class:`int`
+        number of conversions served from the cache.
+    misses: :class:`int`
+        number of conversions that were not in the cache.
+    """
+    def __init__(self, path: Union[os.PathLike, str]=None, *, max_size: int=1 << 30) -> None:
+        self.path: str = os.fspath(path) if path is not None else os.path.join(_cache_dir(), "conversions")
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """fraction of lookups that were served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def size(self) -> int:
+        """total size of the stored outputs in bytes."""
+        return sum(os.path.getsize(path) for path in self._entries())
+
+    def _entries(self):
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(".tmp"):
+                    yield os.path.join(root, name)
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key: str, output: Union[os.PathLike, IOBase, str]) -> bool:
+        """copies the output stored under ``key`` to ``output``.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            key of the stored output.
+        output: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+            destination for the stored output.
+
+        Returns
+        -------
+        :class:`bool`
+            true when the key was found and copied.
+        """
+        entry = self._entry(key)
+        try:
+            if isinstance(output, IOBase):
+                with open(entry, "rb") as f:
+                    shutil.copyfileobj(f, output)
+            else:
+                shutil.copyfile(entry, output)
+            # the modification time doubles as the last use, for eviction
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def put(self, key: str, output: Union[os.PathLike, str]) -> None:
+        """stores a copy of ``output`` under ``key``, then evicts the least recently used outputs past ``max_size``.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            key to store the output under.
+        output: Union[:class:`os.PathLike`, :class:`str`]
+            path of the output to store.
+        """
+        entry = self._entry(key)
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            temp = f"{entry}.{os.getpid()}.tmp"
+            shutil.copyfile(output, temp)
+            os.replace(temp, entry)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """removes the least recently used outputs until the store fits in ``max_size``."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """removes every stored output, and resets the statistics."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.hits = 0
+        self.misses = 0
@@ -1,15 +1,81 @@
-from asciipy import VideoConverter, ImageConverter, GifConverter, ConverterConfig, __version__ as version
+from asciipy import VideoConverter, ImageConverter, GifConverter, BatchConverter, ConverterConfig, MediaInfo, probe, __version__ as version
+from asciipy.url_ import urlcheck, download
+import argparse
+import contextlib
 import sys
-from PIL import UnidentifiedImageError
 
 _help = f"""
 asciipy {version}
 
 Usage:
 asciipy [input_file] [output_file] [width] (optional, default=80)
+asciipy [input_file] - [width] (prints to the terminal, videos are played)
+asciipy --batch [output_dir] [inputs ...] [--width width] [--processes processes]
+asciipy --raw [output_file] --size [width]x[height] [--fps fps] [--width width] [--input path]
 """
 
+def _read_inputs(inputs):
+    # @path reads a list of inputs from a file, one per line
+    paths = []
+    for _input in inputs:
+        if _input.startswith('@'):
+            with open(_input[1:]) as f:
+                paths.extend(line.strip() for line in f if line.strip())
+        else:
+            paths.append(_input)
+    return paths
+
+def _batch(args):
+    parser = argparse.ArgumentParser(prog='asciipy --batch', description='convert many images into a directory.')
+    parser.add_argument('output', help='directory the outputs are written to.')
+    parser.add_argument('inputs', nargs='+', help='files, directories, glob patterns, or @file for a list of inputs.')
+    parser.add_argument('--width', type=int, default=80, help='width of the outputs in characters.')
+    parser.add_argument('--processes', type=int, default=None, help='number of converter processes, by default one per cpu.')
+    args = parser.parse_args(args)
+
+    conf = ConverterConfig(width=args.width)
+    with BatchConverter(ImageConverter(conf), processes=args.processes) as batch:
+        results = batch.convert(_read_inputs(args.inputs), args.output)
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"failed to convert {result.input}: {result.error.strip().splitlines()[-1]}")
+    print(f"converted {len(results) - len(failed)}/{len(results)} files.")
+    return 1 if failed else 0
+
+def _size(value):
+    width, _, height = value.lower().partition('x')
+    return int(width), int(height)
+
+def _raw(args):
+    parser = argparse.ArgumentParser(prog='asciipy --raw', description='convert raw rgb24 frames, like the output of `ffmpeg -f rawvideo -pix_fmt rgb24 -`, as they arrive.')
+    parser.add_argument('output', help='destination path for the output video, or - to print the frames to the terminal.')
+    parser.add_argument('--size', type=_size, required=True, help='size of the raw frames, as [width]x[height].')
+    parser.add_argument('--fps', type=float, default=30.0, help='frame rate of the raw frames.')
+    parser.add_argument('--width', type=int, default=80, help='width of the output in characters.')
+    parser.add_argument('--input', default=None, help='path of a file or fifo to read the frames from, by default stdin.')
+    args = parser.parse_args(args)
+
+    to_terminal = args.output == '-'
+    conf = ConverterConfig(width=args.width, text_mode='truecolor' if to_terminal else None)
+    source = sys.stdin.buffer if args.input is None else args.input
+    terminal = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        VideoConverter(conf).convert_frames(source, terminal if to_terminal else args.output, size=args.size, fps=args.fps)
+    return 0
+
+def _converter(media: MediaInfo, conf: ConverterConfig):
+    # the probe decides the converter up front, so an input is only decoded by the converter that handles it
+    if media.kind == "video":
+        return VideoConverter(conf)
+    if media.kind == "animation":
+        return GifConverter(conf)
+    return ImageConverter(conf)
+
 def main():
+    if sys.argv[1:2] == ['--batch']:
+        return _batch(sys.argv[2:])
+    if sys.argv[1:2] == ['--raw']:
+        return _raw(sys.argv[2:])
     try:
         _input = sys.argv[1]
         output = sys.argv[2]
@@ -20,15 +86,26 @@ def main():
     width = 80
     if len(sys.argv) == 4:
         width = int(sys.argv[3])
-    conf = ConverterConfig(width=width)
-    try:
-        GifConverter(conf).convert(_input, output)
-    except (UnidentifiedImageError, ValueError):
-        try:
-            ImageConverter(conf).convert(_input, output)
-        except UnidentifiedImageError:
-            VideoConverter(conf).convert(_input, output)
+    # "-" writes colored text to the terminal instead of an image
+    to_terminal = output == '-'
+    conf = ConverterConfig(width=width, text_mode='truecolor' if to_terminal else None)
+    if urlcheck(_input):
+        # urls are downloaded here instead of by the converter, so the file can be probed
+        _input = f"./downloaded/{download(_input)}"
+    media = probe(_input)
+    if to_terminal:
+        # the text goes to stdout, so status messages move to stderr
+        terminal = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            converter = _converter(media, conf)
+            if isinstance(converter, VideoConverter):
+                # videos play at their own speed instead of printing every frame as fast as possible
+                converter.play(_input, terminal, media=media)
+            else:
+                converter.convert(_input, terminal, media=media)
+        return
+    _converter(media, conf).convert(_input, output, media=media)
     print('Done!')
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
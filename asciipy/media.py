@@ -0,0 +1,273 @@
+import os
+import struct
+from io import IOBase
+
+from typing import BinaryIO, Union
+
+
+class MediaInfo:
+    """what :func:`probe` found out about an input, without decoding it.
+
+    Attributes
+    -----------
+    kind: :class:`str`
+        ``"image"``, ``"animation"`` (gifs, animated pngs and webps) or ``"video"``.
+    format: Optional[:class:`str`]
+        the container or image format, like ``"png"`` or ``"mp4"``. ``None`` when it wasn't recognised.
+    width: Optional[:class:`int`]
+        width in pixels, ``None`` when the header doesn't say.
+    height: Optional[:class:`int`]
+        height in pixels, ``None`` when the header doesn't say.
+    frames: Optional[:class:`int`]
+        number of frames, ``None`` when the header doesn't say.
+    fps: Optional[:class:`float`]
+        frames per second, ``None`` when the header doesn't say.
+    alpha: :class:`bool`
+        if the input can have transparent pixels.
+    """
+    __slots__ = ("kind", "format", "width", "height", "frames", "fps", "alpha")
+
+    def __init__(self, kind: str, format: str=None, *, width: int=None, height: int=None, frames: int=None, fps: float=None, alpha: bool=False) -> None:
+        self.kind = kind
+        self.format = format
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.fps = fps
+        self.alpha = alpha
+
+    def __repr__(self) -> str:
+        return f"<MediaInfo kind={self.kind!r} format={self.format!r} size={self.width}x{self.height} frames={self.frames} fps={self.fps} alpha={self.alpha}>"
+
+
+# containers recognised by their first bytes, that are only ever video as far as asciipy is concerned
+_video_magic = (
+    (0, b"\x1a\x45\xdf\xa3", "matroska"),
+    (0, b"FLV", "flv"),
+    (0, b"OggS", "ogg"),
+    (0, b"\x00\x00\x01\xba", "mpeg"),
+    (0, b"\x00\x00\x01\xb3", "mpeg"),
+    (0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11", "asf"),
+)
+
+# iso media brands that hold still images rather than video
+_image_brands = {b"heic", b"heix", b"heim", b"heis", b"mif1", b"msf1", b"avif", b"avis"}
+
+
+def probe(source: Union[os.PathLike, IOBase, str]) -> MediaInfo:
+    """reads the header of ``source`` to tell what kind of media it is, so it can be handed to the right converter.
+    the position of file objects is restored afterwards.
+
+    Parameters
+    ----------
+    source: Union[:class:`os.PathLike`, :class:`io.IOBase`, :class:`str`]
+        path or file object of the media.
+
+    Returns
+    -------
+    :class:`MediaInfo`
+        the kind of media, and whatever its header says about it.
+    """
+    if isinstance(source, IOBase):
+        position = source.tell()
+        try:
+            return _probe(source)
+        finally:
+            source.seek(position)
+    with open(source, "rb") as f:
+        return _probe(f)
+
+
+def _probe(f: BinaryIO) -> MediaInfo:
+    start = f.tell()
+    head = f.read(128)
+    f.seek(start)
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return _probe_png(f, start)
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return _probe_gif(f, start)
+    if head.startswith(b"\xff\xd8\xff"):
+        return _probe_jpeg(f, start)
+    if head.startswith(b"BM") and len(head) >= 30:
+        header_size, width, height = struct.unpack("<Iii", head[14:26])
+        # 32 bit bitmaps only have alpha when the header has an alpha mask for it
+        alpha = struct.unpack("<H", head[28:30])[0] == 32 and header_size >= 56 and head[66:70] not in (b"", b"\x00\x00\x00\x00")
+        return MediaInfo("image", "bmp", width=width, height=abs(height), frames=1, alpha=alpha)
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return _probe_webp(f, start)
+    if head.startswith(b"RIFF") and head[8:12] == b"AVI ":
+        return _probe_avi(f, start)
+    if head[4:8] == b"ftyp":
+        if head[8:12] in _image_brands:
+            return _probe_pillow(f, start)
+        return MediaInfo("video", "mp4")
+    if len(head) > 0 and head[0] == 0x47:
+        # mpeg transport streams repeat their sync byte every 188 bytes
+        f.seek(start + 188)
+        if f.read(1) == b"\x47":
+            return MediaInfo("video", "mpegts")
+        f.seek(start)
+    for offset, magic, format in _video_magic:
+        if head[offset:offset + len(magic)] == magic:
+            return MediaInfo("video", format)
+    return _probe_pillow(f, start)
+
+
+def _probe_png(f: BinaryIO, start: int) -> MediaInfo:
+    f.seek(start + 8)
+    info = MediaInfo("image", "png", frames=1)
+    # chunks that describe the image all come before the first IDAT
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        length, chunk = struct.unpack(">I4s", header)
+        data = f.read(length) if chunk in (b"IHDR", b"acTL") else None
+        if data is None:
+            f.seek(length, os.SEEK_CUR)
+        f.seek(4, os.SEEK_CUR)
+        if chunk == b"IHDR":
+            info.width, info.height = struct.unpack(">II", data[:8])
+            info.alpha = data[9] in (4, 6)
+        elif chunk == b"tRNS":
+            info.alpha = True
+        elif chunk == b"acTL":
+            info.frames = struct.unpack(">I", data[:4])[0]
+            if info.frames > 1:
+                info.kind = "animation"
+        elif chunk in (b"IDAT", b"IEND"):
+            break
+    return info
+
+
+def _skip_blocks(f: BinaryIO) -> None:
+    # gif data is split into sub-blocks of up to 255 bytes, ended by an empty one
+    while True:
+        size = f.read(1)
+        if not size or size == b"\x00":
+            return
+        f.seek(size[0], os.SEEK_CUR)
+
+
+def _probe_gif(f: BinaryIO, start: int) -> MediaInfo:
+    f.seek(start + 6)
+    width, height, packed = struct.unpack("<HHB", f.read(5))
+    f.seek(2, os.SEEK_CUR)
+    if packed & 0x80:
+        f.seek(3 << ((packed & 7) + 1), os.SEEK_CUR)
+    frames = 0
+    duration = 0
+    alpha = False
+    while True:
+        block = f.read(1)
+        if block == b"\x21":
+            label = f.read(1)
+            if label == b"\xf9":
+                extension = f.read(5)
+                if len(extension) == 5:
+                    alpha = alpha or bool(extension[1] & 1)
+                    duration += struct.unpack("<H", extension[2:4])[0]
+            _skip_blocks(f)
+        elif block == b"\x2c":
+            descriptor = f.read(9)
+            if len(descriptor) < 9:
+                break
+            if descriptor[8] & 0x80:
+                f.seek(3 << ((descriptor[8] & 7) + 1), os.SEEK_CUR)
+            f.seek(1, os.SEEK_CUR)
+            _skip_blocks(f)
+            frames += 1
+        else:
+            # the trailer, or a truncated file
+            break
+    # delays are in hundredths of a second
+    fps = frames * 100 / duration if frames > 1 and duration else None
+    return MediaInfo("animation" if frames > 1 else "image", "gif", width=width, height=height, frames=frames, fps=fps, alpha=alpha)
+
+
+def _probe_jpeg(f: BinaryIO, start: int) -> MediaInfo:
+    f.seek(start + 2)
+    info = MediaInfo("image", "jpeg", frames=1)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xff:
+            break
+        if marker[1] in (0xd8, 0x01) or 0xd0 <= marker[1] <= 0xd7:
+            continue
+        length = f.read(2)
+        if len(length) < 2:
+            break
+        length = struct.unpack(">H", length)[0]
+        # start of frame markers, except the huffman (c4), jpeg-ls (c8) and arithmetic coding (cc) tables
+        if 0xc0 <= marker[1] <= 0xcf and marker[1] not in (0xc4, 0xc8, 0xcc):
+            data = f.read(5)
+            info.height, info.width = struct.unpack(">HH", data[1:5])
+            break
+        f.seek(length - 2, os.SEEK_CUR)
+    return info
+
+
+def _probe_webp(f: BinaryIO, start: int) -> MediaInfo:
+    f.seek(start + 12)
+    info = MediaInfo("image", "webp", frames=1)
+    animated = False
+    frames = 0
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        chunk, length = struct.unpack("<4sI", header)
+        data = f.read(min(length, 16))
+        f.seek(length - len(data) + (length & 1), os.SEEK_CUR)
+        if chunk == b"VP8X" and len(data) >= 10:
+            info.alpha = bool(data[0] & 0x10)
+            animated = bool(data[0] & 0x02)
+            info.width = int.from_bytes(data[4:7], "little") + 1
+            info.height = int.from_bytes(data[7:10], "little") + 1
+            if not animated:
+                break
+        elif chunk == b"VP8 " and len(data) >= 10:
+            info.width = struct.unpack("<H", data[6:8])[0] & 0x3fff
+            info.height = struct.unpack("<H", data[8:10])[0] & 0x3fff
+            break
+        elif chunk == b"VP8L" and len(data) >= 5:
+            bits = struct.unpack("<I", data[1:5])[0]
+            info.width = (bits & 0x3fff) + 1
+            info.height = ((bits >> 14) & 0x3fff) + 1
+            info.alpha = bool((bits >> 28) & 1)
+            break
+        elif chunk == b"ANMF":
+            frames += 1
+    if animated:
+        info.frames = frames
+        if frames > 1:
+            info.kind = "animation"
+    return info
+
+
+def _probe_avi(f: BinaryIO, start: int) -> MediaInfo:
+    # the main avi header sits near the start of the file, inside the hdrl list
+    f.seek(start)
+    head = f.read(1024)
+    info = MediaInfo("video", "avi")
+    index = head.find(b"avih")
+    if index != -1 and len(head) >= index + 48:
+        micro_sec_per_frame, = struct.unpack("<I", head[index + 8:index + 12])
+        info.frames, = struct.unpack("<I", head[index + 24:index + 28])
+        info.width, info.height = struct.unpack("<II", head[index + 40:index + 48])
+        if micro_sec_per_frame:
+            info.fps = 1e6 / micro_sec_per_frame
+    return info
+
+
+def _probe_pillow(f: BinaryIO, start: int) -> MediaInfo:
+    # anything else is left to pillow, which only reads the header when opening. inputs pillow can't identify are assumed to be video
+    from PIL import Image, UnidentifiedImageError
+    f.seek(start)
+    try:
+        img = Image.open(f)
+    except UnidentifiedImageError:
+        return MediaInfo("video")
+    frames = getattr(img, "n_frames", 1)
+    alpha = img.mode in ("RGBA", "LA", "PA", "RGBa", "La") or "transparency" in img.info
+    return MediaInfo("animation" if frames > 1 else "image", img.format.lower(), width=img.width, height=img.height, frames=frames, alpha=alpha)
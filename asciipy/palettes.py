@@ -1,5 +1,11 @@
 # note: these palettes were not taken from official sources, and my be incorrecet
 
+import hashlib
+import os
+import numpy as np
+
+from typing import Dict, List, Tuple
+
 c64 = [
     (0, 0, 0),
     (0, 0, 170),
@@ -118,4 +124,81 @@ grayscale = [
 ]
 """
 gray scale color palette (contains some off-grays).
-"""
\ No newline at end of file
+"""
+
+
+_tables: Dict[Tuple[Tuple[int, int, int], ...], Tuple[np.ndarray, np.ndarray]] = {}
+
+def _cache_dir() -> str:
+    return os.environ.get("ASCIIPY_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "asciipy")
+
+def _builtin_name(palette: List[Tuple[int, int, int]]) -> str:
+    for name in ("c64", "nes", "cmd", "grayscale"):
+        if palette == globals()[name]:
+            return name
+    return None
+
+def _build_table(colors: np.ndarray) -> np.ndarray:
+    # index of the nearest color for every RGB value, argmin keeps the first (smallest) color on ties
+    levels = np.arange(256, dtype=np.int32)
+    red = (levels[:, None] - colors[:, 0]) ** 2
+    green = (levels[:, None] - colors[:, 1]) ** 2
+    blue = (levels[:, None] - colors[:, 2]) ** 2
+    table = np.empty((256, 256, 256), dtype=np.uint8 if len(colors) <= 256 else np.uint16)
+    for r in range(256):
+        table[r] = (red[r] + green[:, None, :] + blue[None, :, :]).argmin(axis=-1)
+    return table
+
+def _fill(colors: np.ndarray, table: np.ndarray, codes: np.ndarray) -> None:
+    # computes the nearest color of packed rgb values the table doesn't know yet, in chunks so memory stays bounded
+    for start in range(0, len(codes), 4096):
+        chunk = codes[start:start + 4096]
+        rgb = np.stack(((chunk >> 16) & 255, (chunk >> 8) & 255, chunk & 255), axis=-1)
+        distances = ((rgb[:, None, :] - colors[None, :, :]) ** 2).sum(axis=-1)
+        table[rgb[:, 0], rgb[:, 1], rgb[:, 2]] = distances.argmin(axis=-1) + 1
+
+def _compile(palette: List[Tuple[int, int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """returns the palette as a sorted color array, and a 256x256x256 table of nearest color indices.
+    built-in palettes get a complete table, which is cached on disk. other palettes get an empty table (index + 1, 0 while unknown)
+    that :func:`_lookup` fills in as colors are seen, so a custom palette costs nothing up front. tables are kept in memory."""
+    key = tuple(tuple(color) for color in palette)
+    try:
+        return _tables[key]
+    except KeyError:
+        pass
+    colors = np.array(sorted(key), dtype=np.int32)
+    name = _builtin_name(palette)
+    if name is None:
+        # zeroed memory is only allocated once it is written to
+        _tables[key] = colors, np.zeros((256, 256, 256), dtype=np.uint16 if len(colors) < 65535 else np.uint32)
+        return _tables[key]
+    digest = hashlib.sha1(colors.tobytes()).hexdigest()[:16]
+    path = os.path.join(_cache_dir(), "palettes", f"{name}-{digest}.npy")
+    try:
+        table = np.load(path)
+    except (OSError, ValueError):
+        table = _build_table(colors)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as f:
+                np.save(f, table)
+            os.replace(temp, path)
+        except OSError:
+            pass
+    _tables[key] = colors, table
+    return _tables[key]
+
+def _lookup(palette: List[Tuple[int, int, int]], rgb: np.ndarray) -> np.ndarray:
+    """index into the sorted palette of the nearest color of every rgb value, ties resolve to the smallest color."""
+    colors, table = _compile(palette)
+    red, green, blue = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    index = table[red, green, blue]
+    if table.dtype == np.uint8:
+        return index
+    unknown = index == 0
+    if unknown.any():
+        codes = (red[unknown].astype(np.int64) << 16) | (green[unknown].astype(np.int64) << 8) | blue[unknown]
+        _fill(colors, table, np.unique(codes))
+        index = table[red, green, blue]
+    return index.astype(np.intp) - 1
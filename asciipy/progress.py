@@ -0,0 +1,104 @@
+import queue
+from time import perf_counter
+
+from typing import Any, Callable, Union
+
+
+class Progress:
+    """a snapshot of a running conversion, delivered to the ``progress`` callback or queue of a :class:`~asciipy.VideoConverter`.
+
+    Attributes
+    -----------
+    frames: :class:`int`
+        number of frames rendered so far.
+    total: Optional[:class:`int`]
+        number of frames in the input, ``None`` when the container doesn't say.
+    elapsed: :class:`float`
+        seconds since rendering started.
+    fps: :class:`float`
+        recent rendering speed in frames per second.
+    eta: Optional[:class:`float`]
+        estimated seconds until every frame is rendered, ``None`` when ``total`` or ``fps`` is unknown.
+    done: :class:`bool`
+        true for the last update of a conversion.
+    """
+    __slots__ = ("frames", "total", "elapsed", "fps", "eta", "done")
+
+    def __init__(self, frames: int, total: int, elapsed: float, fps: float, eta: float, done: bool) -> None:
+        self.frames = frames
+        self.total = total
+        self.elapsed = elapsed
+        self.fps = fps
+        self.eta = eta
+        self.done = done
+
+    @property
+    def percent(self) -> Union[float, None]:
+        """percentage of the frames rendered, ``None`` when ``total`` is unknown."""
+        if not self.total:
+            return None
+        return min(self.frames / self.total, 1.0) * 100
+
+    def __repr__(self) -> str:
+        return f"<Progress frames={self.frames} total={self.total} fps={self.fps:.1f} eta={self.eta} done={self.done}>"
+
+
+def _print_progress(progress: Progress) -> None:
+    if progress.percent is not None:
+        print(f"\rloading video... {round(progress.percent)}% complete. ", end='')
+    else:
+        print(f"\rloading video... {progress.frames} frames complete. ", end='')
+    if progress.done:
+        print('\n')
+
+
+class _ProgressReporter:
+    # counts finished frames and hands a Progress to the sink at most once per interval, the last update is always delivered
+    def __init__(self, sink: Union[Callable[[Progress], Any], "queue.Queue"], total: float, interval: float) -> None:
+        if isinstance(sink, (queue.Queue, queue.SimpleQueue)) or hasattr(sink, "put_nowait"):
+            self._queue = sink
+            self._emit = self._put
+        else:
+            self._emit = sink
+        self.total = int(total) if total and total > 0 else None
+        self.interval = interval
+        self.frames = 0
+        self.fps = 0.0
+        self._start = self._last = perf_counter()
+        self._last_frames = 0
+
+    def update(self, frames: int=1) -> None:
+        self.frames += frames
+        now = perf_counter()
+        if now - self._last >= self.interval:
+            self._report(now, False)
+
+    def finish(self) -> None:
+        self._report(perf_counter(), True)
+
+    def _put(self, progress: Progress) -> None:
+        # a full queue loses its oldest update, progress never stops a conversion
+        try:
+            self._queue.put_nowait(progress)
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(progress)
+            except queue.Full:
+                pass
+
+    def _report(self, now: float, done: bool) -> None:
+        if now > self._last:
+            rate = (self.frames - self._last_frames) / (now - self._last)
+            # smoothed, so a single slow frame doesn't swing the eta
+            self.fps = rate if self._last_frames == 0 else 0.7 * self.fps + 0.3 * rate
+        self._last, self._last_frames = now, self.frames
+        eta = None
+        if done:
+            eta = 0.0
+        elif self.total is not None and self.fps > 0:
+            eta = max(self.total - self.frames, 0) / self.fps
+        self._emit(Progress(self.frames, self.total, now - self._start, self.fps, eta, done))
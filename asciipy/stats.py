@@ -0,0 +1,98 @@
+import threading
+from time import perf_counter
+
+from typing import Any, Callable, Dict, Tuple
+
+
+class ConversionStats:
+    """timings and counts collected during a single conversion, see :attr:`~asciipy.BaseConverter.stats`.
+    stages are timed exclusively, time spent in a stage nested inside another (like rendering frames while a gif is being encoded) only counts towards the inner stage.
+
+    stages: ``download``, ``cache``, ``decode``, ``resize``, ``color``, ``background``, ``glyphs``, ``pixels`` (the per-pixel renderer used with overridden hooks), ``text`` (formatting the text output modes), ``encode`` and ``mux``.
+
+    Attributes
+    -----------
+    timings: Dict[:class:`str`, :class:`float`]
+        seconds spent in each stage.
+    counts: Dict[:class:`str`, :class:`int`]
+        number of times each stage ran, the number of ``frames`` rendered, and the number of frames ``dropped`` by :meth:`~asciipy.VideoConverter.play`.
+    """
+    def __init__(self, callback: Callable[[str, float], Any]=None) -> None:
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._callback = callback
+        self._local = threading.local()
+
+    @property
+    def total(self) -> float:
+        """seconds spent in all stages."""
+        return sum(self.timings.values())
+
+    def add(self, stage: str, seconds: float, count: int=1) -> None:
+        """adds ``seconds`` to a stage, and passes it on to the callback."""
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        self.counts[stage] = self.counts.get(stage, 0) + count
+        if self._callback is not None:
+            self._callback(stage, seconds)
+
+    def count(self, name: str, count: int=1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + count
+
+    def stage(self, name: str) -> "_Stage":
+        return _Stage(self, name)
+
+    def _stack(self) -> list:
+        # stages nest per thread, the video pipeline writes frames in a thread while the main thread decodes
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _drain(self) -> Tuple[Dict[str, float], Dict[str, int]]:
+        # hands the collected numbers to the parent process, and starts over
+        drained = self.timings, self.counts
+        self.timings, self.counts = {}, {}
+        return drained
+
+    def _merge(self, drained: Tuple[Dict[str, float], Dict[str, int]]) -> None:
+        timings, counts = drained
+        for stage, seconds in timings.items():
+            self.add(stage, seconds, counts.get(stage, 0))
+        for name, count in counts.items():
+            if name not in timings:
+                self.count(name, count)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # converter processes start with empty stats, the callback only runs in the process that started the conversion
+        return {"timings": {}, "counts": {}, "_callback": None}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def __repr__(self) -> str:
+        stages = ", ".join(f"{stage}={seconds:.4f}s" for stage, seconds in sorted(self.timings.items(), key=lambda item: -item[1]))
+        return f"<ConversionStats total={self.total:.4f}s {stages}>"
+
+
+class _Stage:
+    __slots__ = ("stats", "name", "start", "nested")
+
+    def __init__(self, stats: ConversionStats, name: str) -> None:
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        self.nested = 0.0
+        self.stats._stack().append(self)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        elapsed = perf_counter() - self.start
+        stack = self.stats._stack()
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+        self.stats.add(self.name, elapsed - self.nested)
@@ -0,0 +1,148 @@
+import io
+import os
+from io import IOBase
+
+import numpy as np
+
+from typing import Any, Union
+
+_text_modes = ("plain", "ansi256", "truecolor")
+
+# no color, which is also the state after the reset at the end of every line
+_default = -1
+# a cell that only holds a space, its foreground color doesn't matter
+_any = -2
+
+_cube = np.array([0, 95, 135, 175, 215, 255])
+# nearest cube level of every channel value
+_levels = np.abs(np.arange(256)[:, None] - _cube).argmin(axis=1)
+# escape sequences of the 256 colors, and the default color at index -1
+_escapes_256 = (
+    np.array([f"\x1b[38;5;{i}m" for i in range(256)] + ["\x1b[39m"], dtype=object),
+    np.array([f"\x1b[48;5;{i}m" for i in range(256)] + ["\x1b[49m"], dtype=object),
+)
+# pieces of the truecolor sequences, so no string has to be formatted per cell. index 256 is empty, for the default color
+_channels = np.array([f"{i};" for i in range(256)] + [""], dtype=object)
+_channels_end = np.array([f"{i}m" for i in range(256)] + [""], dtype=object)
+_prefixes = (
+    np.array(["\x1b[38;2;", "\x1b[39m"], dtype=object),
+    np.array(["\x1b[48;2;", "\x1b[49m"], dtype=object),
+)
+
+
+def _ansi256(rgb: np.ndarray) -> np.ndarray:
+    """nearest xterm 256 color index of every rgb value, from the 6x6x6 cube or the 24 step gray ramp.
+    the first 16 colors are left out, terminals theme them differently."""
+    rgb = np.clip(rgb[..., :3], 0, 255).astype(np.intp)
+    levels = _levels[rgb]
+    cube = _cube[levels]
+    cube_index = 16 + 36 * levels[..., 0] + 6 * levels[..., 1] + levels[..., 2]
+    gray_level = np.clip((rgb.sum(axis=-1) // 3 - 3) // 10, 0, 23)
+    gray = (8 + 10 * gray_level)[..., None]
+    cube_distance = ((rgb - cube) ** 2).sum(axis=-1)
+    gray_distance = ((rgb - gray) ** 2).sum(axis=-1)
+    return np.where(gray_distance < cube_distance, 232 + gray_level, cube_index)
+
+
+def _codes(colors: np.ndarray, mode: str) -> np.ndarray:
+    # one int per cell, equal colors get equal codes
+    if mode == "ansi256":
+        return _ansi256(colors)
+    rgb = colors[..., :3].astype(np.int64)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def _fill_forward(codes: np.ndarray) -> np.ndarray:
+    # cells that don't care take the code of the cell before them, so they don't break a run
+    index = np.where(codes != _any, np.arange(codes.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    codes = np.take_along_axis(codes, index, axis=1)
+    codes[codes == _any] = _default
+    return codes
+
+
+def _write_escapes(slots: np.ndarray, codes: np.ndarray, mode: str, back: bool) -> None:
+    # fills the escape slots of the cells in ``codes``, with pieces from the tables above
+    if mode == "ansi256":
+        slots[:, 0] = _escapes_256[back][codes]
+        return
+    default = codes == _default
+    slots[:, 0] = _prefixes[back][default.view(np.int8)]
+    channels = np.where(default[:, None], 256, (codes[:, None] >> np.array([16, 8, 0])) & 255)
+    slots[:, 1] = _channels[channels[:, 0]]
+    slots[:, 2] = _channels[channels[:, 1]]
+    slots[:, 3] = _channels_end[channels[:, 2]]
+
+
+def _changes(codes: np.ndarray) -> np.ndarray:
+    # every line starts after a reset, so its first cell only changes away from the default color
+    changed = np.empty(codes.shape, dtype=bool)
+    changed[:, 0] = codes[:, 0] != _default
+    np.not_equal(codes[:, 1:], codes[:, :-1], out=changed[:, 1:])
+    return changed
+
+
+def _format_text(chars: np.ndarray, glyphs: str, fore: np.ndarray, fore_mask: np.ndarray, back: np.ndarray=None, back_mask: np.ndarray=None, back_layer: tuple=None, mode: str="plain") -> str:
+    """builds the text of a character grid, one line per row, cells outside ``fore_mask`` are spaces.
+    in the ansi modes an escape sequence is only written where the color changes, and every line ends with a reset."""
+    height, width = chars.shape
+    table = np.array(list(glyphs) + [" "], dtype=object)
+    cells = table[np.where(fore_mask, chars, len(glyphs))]
+    if mode == "plain":
+        return "".join(np.hstack((cells, np.full((height, 1), "\n", dtype=object))).ravel().tolist())
+
+    fore_codes = _fill_forward(np.where(fore_mask, _codes(fore, mode), _any))
+    if back is not None:
+        back_codes = np.where(back_mask, _codes(back, mode), _default)
+        if back_layer is not None:
+            back_codes[~back_mask] = _codes(np.array(back_layer), mode)
+    else:
+        back_codes = np.full(chars.shape, _default)
+
+    # each cell is its foreground escape, background escape and character, split into slots that stay empty where nothing changed
+    size = 1 if mode == "ansi256" else 4
+    layers = [(fore_codes, False)] if back is None else [(fore_codes, False), (back_codes, True)]
+    parts = np.full((height, width, size * len(layers) + 1), "", dtype=object)
+    parts[..., -1] = cells
+    for i, (codes, is_back) in enumerate(layers):
+        changed = _changes(codes)
+        if changed.any():
+            slots = parts[..., i * size:(i + 1) * size][changed]
+            _write_escapes(slots, codes[changed], mode, is_back)
+            parts[..., i * size:(i + 1) * size][changed] = slots
+    ends = np.where((fore_codes[:, -1] != _default) | (back_codes[:, -1] != _default), "\x1b[0m\n", "\n").astype(object)
+    return "".join(np.hstack((parts.reshape(height, -1), ends[:, None])).ravel().tolist())
+
+
+class _TextWriter:
+    # writes frames of text to a path, or to any text or binary stream. plain text frames are drawn over each other too with ``redraw``
+    def __init__(self, output: Union[os.PathLike, IOBase, str, Any], mode: str, animated: bool=False, redraw: bool=None) -> None:
+        self.mode = mode
+        self.animated = animated
+        self.redraw = mode != "plain" if redraw is None else redraw
+        self.frames = 0
+        self._close = not hasattr(output, "write")
+        if self._close:
+            self._file = open(output, "w", encoding="utf-8", newline="")
+        else:
+            self._file = output
+        self._binary = isinstance(self._file, (io.RawIOBase, io.BufferedIOBase))
+
+    def write(self, text: str) -> None:
+        if self.animated:
+            if not self.redraw:
+                # frames are separated like pages
+                text = text if self.frames == 0 else "\f" + text
+            else:
+                # every frame is drawn over the last one, the first clears the screen
+                text = ("\x1b[2J\x1b[H" if self.frames == 0 else "\x1b[H") + text
+        self._file.write(text.encode("utf-8") if self._binary else text)
+        if self.animated:
+            self._file.flush()
+        self.frames += 1
+
+    def close(self) -> None:
+        if self._close:
+            self._file.close()
+        else:
+            self._file.flush()
@@ -1,26 +1,21 @@
 import re
-from io import BytesIO
 from urllib import parse
+import hashlib
+import io
+import json
 import os
 import shutil
+import threading
+from importlib.util import find_spec
 
-from typing import Union
+from typing import Dict, Tuple, Union
 
-try:
-    import requests
-    req = True
-except ImportError:
-    req = False
+# requests and youtube-dl are slow to import, so they are only checked for here and imported once a url is downloaded
+req = find_spec('requests') is not None
 
-try:
-    try:
-        import yt_dlp as youtube
-    except ImportError:
-        import youtube_dl as youtube
-    yt_regex = re.compile(r'^((?:https?:)?\/\/)?((?:www|m|music)\.)?((?:youtube(-nocookie)?\.com|youtu.be))(\/(?:[\w\-]+\?v=|embed\/|v\/)?)([\w\-]+)(\S+)?$')
-    yt = True
-except ImportError:
-    yt = False
+yt_regex = re.compile(r'^((?:https?:)?\/\/)?((?:www|m|music)\.)?((?:youtube(-nocookie)?\.com|youtu.be))(\/(?:[\w\-]+\?v=|embed\/|v\/)?)([\w\-]+)(\S+)?$')
+
+yt = find_spec('yt_dlp') is not None or find_spec('youtube_dl') is not None
 
 url = re.compile(
         r'^(?:http|ftp)s?://' # http:// or https://
@@ -33,7 +28,15 @@ url = re.compile(
 
 _ext: str = None
 
-if yt:
+_chunk_size = 1 << 20
+_session: "requests.Session" = None
+
+def _youtube():
+    try:
+        import yt_dlp as youtube
+    except ImportError:
+        import youtube_dl as youtube
+
     class VideoProcessor(youtube.postprocessor.PostProcessor):
         def run(self, info):
             global _ext
@@ -41,6 +44,8 @@ if yt:
             shutil.move(_ext, f'./downloaded/{_ext}')
             return [], info
 
+    return youtube, VideoProcessor
+
 class ytdlNotInstalled(Exception):
     pass
 
@@ -52,6 +57,239 @@ def urlcheck(text: str) -> Union[bool, None]:
         return re.match(url, text) is not None
     return None
 
+def _get_session() -> "requests.Session":
+    # one session for every download, so connections to the same host are reused
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+def _meta_path(url: str) -> str:
+    return f"./downloaded/.meta/{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+def _read_meta(url: str) -> Dict[str, str]:
+    try:
+        with open(_meta_path(url)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        stat = os.stat(f"./downloaded/{meta['name']}")
+    except (OSError, KeyError):
+        return None
+    # the file may have been replaced by a download from another url with the same name
+    if meta.get('url') != url or meta.get('size') != stat.st_size or meta.get('mtime') != stat.st_mtime_ns:
+        return None
+    return meta
+
+def _write_meta(url: str, meta: Dict[str, str]) -> None:
+    os.makedirs('./downloaded/.meta', exist_ok=True)
+    temp = f"{_meta_path(url)}.{os.getpid()}.tmp"
+    with open(temp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(temp, _meta_path(url))
+
+def _request(url: str) -> Tuple["requests.Response", Dict[str, str]]:
+    # a cached copy is revalidated with its ETag / Last-Modified, a 304 response means it can be reused as is
+    meta = _read_meta(url)
+    headers = {}
+    if meta is not None:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    r = _get_session().get(url, stream=True, headers=headers)
+    if meta is not None and r.status_code == 304:
+        r.close()
+        return None, meta
+    try:
+        r.raise_for_status()
+    except BaseException:
+        r.close()
+        raise
+    return r, None
+
+def _name(url: str) -> str:
+    return os.path.split(parse.urlparse(url).path)[1] or hashlib.sha1(url.encode()).hexdigest()
+
+def _finish_meta(url: str, name: str, r: "requests.Response") -> None:
+    if r.headers.get('ETag') or r.headers.get('Last-Modified'):
+        stat = os.stat(f'./downloaded/{name}')
+        _write_meta(url, {'url': url, 'name': name, 'etag': r.headers.get('ETag'), 'last_modified': r.headers.get('Last-Modified'), 'size': stat.st_size, 'mtime': stat.st_mtime_ns})
+
+def _fetch(url: str) -> str:
+    # streams the body to disk in large chunks
+    r, meta = _request(url)
+    if r is None:
+        return meta['name']
+    with r:
+        name = _name(url)
+        temp = f'./downloaded/{name}.{os.getpid()}.part'
+        try:
+            with open(temp, 'wb') as f:
+                for chunk in r.iter_content(chunk_size=_chunk_size):
+                    f.write(chunk)
+            os.replace(temp, f'./downloaded/{name}')
+        except BaseException:
+            try:
+                os.remove(temp)
+            except FileNotFoundError:
+                pass
+            raise
+    _finish_meta(url, name, r)
+    return name
+
+
+class _Download:
+    """downloads a url into ./downloaded/ in a background thread, while readers consume the bytes that have already arrived."""
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._response, meta = _request(url)
+        self._written = 0
+        self._done = False
+        self._error: BaseException = None
+        self._condition = threading.Condition()
+        if self._response is None:
+            # revalidated, the file on disk is already complete
+            self.name = meta['name']
+            self.path = f'./downloaded/{self.name}'
+            self._written = os.path.getsize(self.path)
+            self._done = True
+            return
+        self.name = _name(url)
+        self.path = f'./downloaded/{self.name}'
+        # the metadata is only written once the file is complete, so a partial file is never revalidated
+        self._file = open(self.path, 'wb')
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            with self._response as r, self._file as f:
+                for chunk in self._chunks(r):
+                    f.write(chunk)
+                    f.flush()
+                    with self._condition:
+                        self._written += len(chunk)
+                        self._condition.notify_all()
+            _finish_meta(self.url, self.name, self._response)
+        except BaseException as e:
+            self._error = e
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    @staticmethod
+    def _chunks(r: "requests.Response"):
+        # read1 hands back whatever has arrived so far, iter_content would wait for a whole chunk
+        read1 = getattr(r.raw, 'read1', None)
+        if read1 is None:
+            yield from r.iter_content(chunk_size=1 << 16)
+            return
+        while True:
+            chunk = read1(_chunk_size, decode_content=True)
+            if not chunk:
+                break
+            yield chunk
+
+    def wait_for(self, size: int) -> bool:
+        """blocks until at least ``size`` bytes were written, returns false when the download ended first."""
+        with self._condition:
+            while self._written < size and not self._done:
+                self._condition.wait()
+            if self._error is not None:
+                raise self._error
+            return self._written >= size
+
+    def wait(self) -> str:
+        """blocks until the download is complete, and returns its path."""
+        with self._condition:
+            while not self._done:
+                self._condition.wait()
+            if self._error is not None:
+                raise self._error
+        return self.path
+
+    def open(self) -> io.BufferedReader:
+        # buffered, so read(n) waits for all n bytes like a file would instead of returning what has arrived
+        return io.BufferedReader(_DownloadReader(self))
+
+    def pipe(self) -> str:
+        """path to a fifo fed with the downloaded bytes as they arrive, for readers that can only open paths.
+        falls back to the complete file where fifos are not supported."""
+        if not hasattr(os, 'mkfifo'):
+            return self.wait()
+        path = f'{self.path}.{os.getpid()}.fifo'
+        os.mkfifo(path)
+        threading.Thread(target=self._pump, args=(path,), daemon=True).start()
+        return path
+
+    def _pump(self, path: str) -> None:
+        try:
+            with self.open() as reader, open(path, 'wb') as fifo:
+                shutil.copyfileobj(reader, fifo, _chunk_size)
+        except (BrokenPipeError, OSError):
+            # the reading end went away, the download itself carries on
+            pass
+
+    @staticmethod
+    def release(path: str) -> None:
+        """unblocks and removes a fifo from :meth:`pipe`, whether or not anything opened it."""
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            os.close(fd)
+        except OSError:
+            pass
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class _DownloadReader(io.RawIOBase):
+    """a file object over a download in progress, reads past the written bytes block until more arrive."""
+    def __init__(self, download: _Download) -> None:
+        self._download = download
+        self._file = open(download.path, 'rb')
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while True:
+            read = self._file.readinto(b)
+            if read or len(b) == 0:
+                return read
+            if not self._download.wait_for(self._file.tell() + 1):
+                return 0
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            self._download.wait()
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+def stream(url: str) -> Union[_Download, None]:
+    """starts downloading ``url`` in the background, returns None for urls that can only be downloaded whole (youtube)."""
+    if re.match(yt_regex, url) is not None:
+        return None
+    try:
+        os.mkdir('./downloaded')
+    except FileExistsError:
+        pass
+    return _Download(url)
+
 def download(url: str) -> str:
     try:
         os.mkdir('./downloaded')
@@ -61,20 +299,12 @@ def download(url: str) -> str:
     if re.match(yt_regex, url) is not None:
         if yt == False:
             raise ytdlNotInstalled("youtube-dl or yt-dlp are required to convert youtube videos. install one directly, or install asciipy-any[youtube]")
+        youtube, VideoProcessor = _youtube()
         with youtube.YoutubeDL(params={'format': 'mp4', 'noplaylist': True}) as downloader:
             downloader.add_post_processor(VideoProcessor())
             downloader.download(url)
         ext = _ext
     else:
-        data = BytesIO()
-        data.seek(0)
-        with requests.get(url, stream=True) as r:
-            for chunk in r.iter_content():
-                data.write(chunk)
-        data.seek(0)
-        path = parse.urlparse(url).path
-        ext = os.path.os.path.split(path)[1]
-        with open(f'./downloaded/{ext}', 'wb') as f:
-            f.write(data.read())
+        ext = _fetch(url)
 
     return ext
\ No newline at end of file
@@ -0,0 +1,292 @@
+"""micro-benchmarks for the rendering hot paths.
+
+results are written as json, and compared against a baseline recorded on the same machine with ``--save-baseline``.
+the run fails (exit code 1) when any benchmark is slower than its baseline by more than the threshold,
+or when a short run (``import asciipy``, ``asciipy --help``, a single ImageConverter) imports a dependency it doesn't use.
+a run without a baseline has nothing to compare against, and fails with exit code 2.
+
+usage:
+python benchmarks/bench.py [--output results.json] [--baseline benchmarks/baseline.json] [--threshold 0.25] [--save-baseline] [--quick] [--filter text]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import PIL
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+
+import asciipy
+from asciipy import ImageConverter, GifConverter, VideoConverter, ConverterConfig, BackgroundConfig, palettes
+from samples import synthetic, write_video
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SIZES = {"small": (40, 20), "medium": (120, 60), "large": (240, 120)}
+PALETTES = {"none": None, "c64": palettes.c64, "nes": palettes.nes, "cmd": palettes.cmd, "grayscale": palettes.grayscale}
+
+
+def converter(cls, palette: str, background: bool, transparent: bool, width: int=80, **kwargs):
+    config = ConverterConfig(width=width, palette=PALETTES[palette], transparent=transparent)
+    back = BackgroundConfig(palette=PALETTES[palette]) if background else None
+    return cls(config, back, **kwargs)
+
+
+def measure(func, repeat: int) -> float:
+    """best time of a single call in seconds, each repeat runs for at least 0.2 seconds to keep fast calls out of timer noise."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench_hot_paths(quick: bool, select):
+    results = {}
+    repeat = 3 if quick else 5
+    sizes = {"small": SIZES["small"]} if quick else SIZES
+    for size_name, (width, height) in sizes.items():
+        source = synthetic(width, height)
+        for palette in PALETTES:
+            for background in (False, True):
+                for transparent in (False, True):
+                    name = f"process_image/{size_name}/{palette}/{'back' if background else 'noback'}/{'rgba' if transparent else 'rgb'}"
+                    if not select(name):
+                        continue
+                    conv = converter(ImageConverter, palette, background, transparent, width=width)
+                    img = source.convert(conv._mode)
+                    conv._process_image(img)  # builds the glyph atlas and palette tables outside the timing
+                    results[name] = measure(lambda: conv._process_image(img), repeat)
+
+    # a single wide image split into bands of rows, rendered by one and by four threads
+    if not quick:
+        source = synthetic(600, 300)
+        for workers in (1, 4):
+            name = f"process_image/bands/{workers}"
+            if not select(name):
+                continue
+            conv = ImageConverter(ConverterConfig(width=600, render_workers=workers), BackgroundConfig())
+            img = source.convert(conv._mode)
+            conv._process_image(img)
+            results[name] = measure(lambda: conv._process_image(img), repeat)
+
+    # the palette lookup and background darkening the renderer runs over every frame
+    custom = [(12, 200, 40), (250, 250, 0), (90, 20, 160), (0, 0, 0), (255, 255, 255)]
+    for size_name, (width, height) in sizes.items():
+        rgb = np.asarray(synthetic(width, height))[..., :3]
+        for palette in ("c64", "nes", "cmd", "grayscale"):
+            name = f"nearest_color/{size_name}/{palette}"
+            if select(name):
+                asciipy._nearest_color(rgb, PALETTES[palette])
+                results[name] = measure(lambda: asciipy._nearest_color(rgb, PALETTES[palette]), repeat)
+        # a custom palette fills its table as colors are seen, so the first frame of a process pays for every new color
+        key = tuple(custom)
+        name = f"nearest_color/{size_name}/custom/first"
+        if select(name):
+            def first_frame():
+                palettes._tables.pop(key, None)
+                asciipy._nearest_color(rgb, custom)
+            results[name] = measure(first_frame, repeat)
+        name = f"nearest_color/{size_name}/custom/filled"
+        if select(name):
+            asciipy._nearest_color(rgb, custom)
+            results[name] = measure(lambda: asciipy._nearest_color(rgb, custom), repeat)
+        name = f"darken_hls/{size_name}"
+        if select(name):
+            results[name] = measure(lambda: asciipy._darken_hls(rgb, 0.5), repeat)
+    return results
+
+
+def bench_converters(quick: bool, select, workdir: str):
+    results = {}
+    repeat = 2 if quick else 3
+    still = os.path.join(workdir, "still.png")
+    synthetic(640, 480).save(still)
+    frames = [synthetic(320, 240, seed) for seed in range(4 if quick else 12)]
+    animated = os.path.join(workdir, "animated.gif")
+    frames[0].save(animated, save_all=True, append_images=frames[1:], duration=50, loop=0)
+    video = os.path.join(workdir, "video.avi")
+    write_video(video, frames=len(frames), size=(320, 240))
+
+    for palette in PALETTES:
+        for background in (False, True):
+            for transparent in (False, True):
+                suffix = f"{palette}/{'back' if background else 'noback'}/{'rgba' if transparent else 'rgb'}"
+                name = f"image_converter/{suffix}"
+                if select(name):
+                    conv = converter(ImageConverter, palette, background, transparent)
+                    out = os.path.join(workdir, "out.png")
+                    results[name] = measure(lambda: conv.convert(still, out), repeat)
+                name = f"gif_converter/{suffix}"
+                if select(name):
+                    conv = converter(GifConverter, palette, background, transparent)
+                    out = os.path.join(workdir, "out.gif")
+                    results[name] = measure(lambda: _quiet(conv.convert, animated, out), repeat)
+
+    if shutil.which("ffmpeg") is None:
+        print("ffmpeg not found, skipping video_converter benchmarks.")
+        return results
+    for stream in (False, True):
+        name = f"video_converter/{'stream' if stream else 'frames'}"
+        if select(name):
+            conv = converter(VideoConverter, "none", False, False, progress=False, stream=stream)
+            out = os.path.join(workdir, "out.mp4")
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                results[name] = measure(lambda: _quiet(conv.convert, video, out), repeat)
+            finally:
+                os.chdir(cwd)
+    return results
+
+
+# the code of each startup benchmark, and the slow imports it must not pull in
+STARTUP = {
+    "import": ("import asciipy", ("cv2", "requests", "yt_dlp", "youtube_dl", "multiprocessing", "asyncio", "PIL.ImageDraw", "PIL.ImageFont")),
+    "cli_help": ("import sys; sys.argv = ['asciipy']; from asciipy.cli import main; main()", ("cv2", "requests", "yt_dlp", "youtube_dl", "multiprocessing", "asyncio", "PIL.ImageDraw", "PIL.ImageFont")),
+    "image_converter": ("import sys; from asciipy import ImageConverter; ImageConverter().convert(sys.argv[1], sys.argv[2])", ("cv2", "requests", "yt_dlp", "youtube_dl", "multiprocessing", "asyncio")),
+}
+
+
+def importtime(code: str, *args: str):
+    """runs ``code`` in a fresh interpreter with ``-X importtime``.
+    returns the seconds spent importing, and the names of every module that was imported."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.join(HERE, ".."), os.environ.get("PYTHONPATH")])))
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code, *args], env=env, capture_output=True, text=True, check=True)
+    total = 0.0
+    modules = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        # nested imports are indented, and already part of their parents cumulative time.
+        # the interpreters own startup imports (site, encodings) happen before the code runs
+        if not name[1:].startswith(" ") and name.strip() not in _interpreter_modules():
+            total += int(cumulative) / 1e6
+    return total, modules
+
+
+_startup_floor = None
+
+def _interpreter_modules():
+    global _startup_floor
+    if _startup_floor is None:
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True, check=True)
+        _startup_floor = {line.split("|")[-1].strip() for line in process.stderr.splitlines() if line.startswith("import time:")}
+    return _startup_floor
+
+
+def bench_startup(quick: bool, select, workdir: str):
+    """import time of short lived runs, the best of a few fresh interpreters. returns the results and the slow imports that were found."""
+    results = {}
+    eager = {}
+    repeat = 3 if quick else 7
+    still = os.path.join(workdir, "startup.png")
+    synthetic(64, 48).save(still)
+    for case, (code, lazy) in STARTUP.items():
+        name = f"startup/{case}"
+        if not select(name):
+            continue
+        runs = [importtime(code, still, os.path.join(workdir, "startup-out.png")) for _ in range(repeat)]
+        results[name] = min(total for total, _ in runs)
+        found = sorted(module for module in lazy if module in runs[0][1])
+        if found:
+            eager[name] = found
+    return results, eager
+
+
+def _quiet(func, *args):
+    # the converters print warnings and progress, which would flood the benchmark output
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        func(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def compare(results, baseline, threshold: float):
+    """returns the names of benchmarks slower than ``baseline`` by more than ``threshold`` (0.25 = 25%)."""
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<55} {seconds * 1e3:10.4f} ms  (new)")
+            continue
+        change = seconds / base - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<55} {seconds * 1e3:10.4f} ms  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark the asciipy rendering hot paths.")
+    parser.add_argument("--output", default="benchmark-results.json", help="path the json results are written to.")
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"), help="json results to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a benchmark counts as a regression, 0.25 = 25%%.")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline path instead of comparing.")
+    parser.add_argument("--quick", action="store_true", help="fewer sizes, frames and repeats.")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this text.")
+    args = parser.parse_args(argv)
+
+    select = (lambda name: args.filter in name) if args.filter else (lambda name: True)
+    workdir = tempfile.mkdtemp(prefix="asciipy-bench-")
+    try:
+        results, eager = bench_startup(args.quick, select, workdir)
+        results.update(bench_hot_paths(args.quick, select))
+        results.update(bench_converters(args.quick, select, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "asciipy": asciipy.__version__,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pillow": PIL.__version__,
+            "machine": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    except FileNotFoundError:
+        # without a baseline nothing can be checked, which must not pass as a clean run
+        compare(results, {}, args.threshold)
+        print(f"\nno baseline at {args.baseline}, run with --save-baseline on this machine to create one.")
+        return 2
+    regressions = compare(results, baseline, args.threshold)
+    for name, modules in eager.items():
+        print(f"{name} imported {', '.join(modules)} at startup.")
+        regressions.append(name)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import functools
+import hashlib
+import http.server
+import os
+import threading
+import time
+
+import pytest
+
+# the sample media is shared with the benchmarks, the tests import it from here
+from samples import synthetic, write_video
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    """serves files with an ETag, in small throttled chunks so downloads are still running while they are decoded."""
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        try:
+            with open(self.translate_path(self.path), "rb") as f:
+                data = f.read()
+        except OSError:
+            self.send_error(404)
+            return
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        for start in range(0, len(data), 4096):
+            self.wfile.write(data[start:start + 4096])
+            self.wfile.flush()
+            time.sleep(self.server.throttle)
+
+
+class Server:
+    def __init__(self, directory: str, throttle: float) -> None:
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_Handler, directory=directory))
+        self._server.requests = []
+        self._server.throttle = throttle
+        self.directory = directory
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/{name}"
+
+    def requests(self, name: str) -> list:
+        """the If-None-Match header of every request for ``name``."""
+        return [etag for path, etag in self._server.requests if path == f"/{name}"]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def server(tmp_path):
+    directory = tmp_path / "www"
+    directory.mkdir()
+    server = Server(str(directory), throttle=0.002)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # downloads and temp files go to the working directory
+    path = tmp_path / "work"
+    path.mkdir()
+    monkeypatch.chdir(path)
+    return path
+
+
+def _test_fonts() -> list:
+    # the default bitmap font, and a truetype font when one can be found (set ASCIIPY_TEST_FONT to pick one)
+    fonts = [None]
+    font = os.environ.get("ASCIIPY_TEST_FONT")
+    if font is None:
+        import glob
+        found = sorted(glob.glob("/usr/share/fonts/**/*.ttf", recursive=True) + glob.glob("/Library/Fonts/*.ttf") + glob.glob("C:/Windows/Fonts/*.ttf"))
+        font = found[0] if found else None
+    if font is not None:
+        fonts.append(font)
+    return fonts
+
+
+fonts = _test_fonts()
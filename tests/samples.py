@@ -0,0 +1,27 @@
+"""sample media shared by the tests and the benchmarks."""
+
+import numpy as np
+from PIL import Image
+
+
+def synthetic(width: int, height: int, seed: int=0) -> Image.Image:
+    """a gradient with noise and a partly transparent region, so every code path has work to do."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    rgba[..., 0] = x * 255 // max(width - 1, 1)
+    rgba[..., 1] = y * 255 // max(height - 1, 1)
+    rgba[..., 2] = rng.integers(0, 256, (height, width))
+    rgba[..., 3] = np.where(x < width // 4, rng.integers(0, 256, (height, width)), 255)
+    return Image.fromarray(rgba, "RGBA")
+
+
+def write_video(path: str, frames: int=20, size: tuple=(64, 48), fps: float=10.0) -> str:
+    """an mjpg avi of ``frames`` synthetic frames."""
+    import cv2
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    for i in range(frames):
+        frame = np.asarray(synthetic(*size, seed=i).convert("RGB"))[..., ::-1]
+        writer.write(np.ascontiguousarray(frame))
+    writer.release()
+    return path
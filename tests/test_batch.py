@@ -0,0 +1,47 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from asciipy import BatchConverter, ImageConverter, VideoConverter, ConverterConfig
+
+from conftest import synthetic, write_video
+
+
+def test_same_names_in_different_directories(workdir):
+    for i, name in enumerate(("a", "b")):
+        os.mkdir(name)
+        synthetic(60, 40, seed=i).save(os.path.join(name, "x.png"))
+    with BatchConverter(ImageConverter(ConverterConfig(width=20)), processes=2) as batch:
+        results = batch.convert(["a", "b", "a/x.png"], "out")
+    assert [r.ok for r in results] == [True, True, False]
+    assert [r.output for r in results] == [os.path.join("out", *parts) for parts in (("a", "x.png"), ("b", "x.png"), ("a", "x.png"))]
+    for name in ("a", "b"):
+        expected = os.path.join(name, "single.png")
+        ImageConverter(ConverterConfig(width=20)).convert(os.path.join(name, "x.png"), expected)
+        assert np.array_equal(np.asarray(Image.open(os.path.join("out", name, "x.png"))), np.asarray(Image.open(expected)))
+
+
+def test_single_directory_keeps_file_names(workdir):
+    os.mkdir("in")
+    for i in range(3):
+        synthetic(30, 20, seed=i).save(os.path.join("in", f"{i}.png"))
+    with BatchConverter(ImageConverter(ConverterConfig(width=10)), processes=2) as batch:
+        results = batch.convert("in", "out")
+    assert all(r.ok for r in results)
+    assert sorted(os.listdir("out")) == ["0.png", "1.png", "2.png"]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_videos_in_parallel(workdir):
+    os.mkdir("in")
+    for i in range(4):
+        write_video(os.path.join("in", f"{i}.avi"), frames=10)
+    with BatchConverter(VideoConverter(ConverterConfig(width=20), progress=False), processes=4) as batch:
+        results = batch.convert("in", "out")
+    # each file converts with its own temp frames, one worker's cleanup can't remove another's
+    assert [r.error for r in results] == [None] * 4
+    assert all(os.path.getsize(r.output) > 0 for r in results)
+    assert [f for f in os.listdir() if f.startswith("frames_")] == []
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from asciipy import ImageConverter, ConverterConfig, ConversionCache
+
+from conftest import synthetic
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(tmp_path / "cache")
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_hit_and_miss(cache, tmp_path):
+    source = str(tmp_path / "in.png")
+    synthetic(60, 40).save(source)
+    converter = ImageConverter(ConverterConfig(width=20, cache=cache))
+    converter.convert(source, str(tmp_path / "first.png"))
+    assert (cache.hits, cache.misses) == (0, 1)
+    converter.convert(source, str(tmp_path / "second.png"))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert read(tmp_path / "first.png") == read(tmp_path / "second.png")
+
+    # another configuration, or the same path with new contents, is converted again
+    ImageConverter(ConverterConfig(width=21, cache=cache)).convert(source, str(tmp_path / "wide.png"))
+    synthetic(60, 40, seed=1).save(source)
+    converter.convert(source, str(tmp_path / "changed.png"))
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert read(tmp_path / "changed.png") != read(tmp_path / "first.png")
+    assert cache.hit_rate == 0.25
+
+
+def test_overridden_hooks_are_not_cached(cache, tmp_path):
+    class Inverted(ImageConverter):
+        def _get_color(self, col):
+            return tuple(255 - v for v in col[:3])
+
+    source = str(tmp_path / "in.png")
+    synthetic(60, 40).save(source)
+    ImageConverter(ConverterConfig(width=20, cache=cache)).convert(source, str(tmp_path / "plain.png"))
+    Inverted(ConverterConfig(width=20, cache=cache)).convert(source, str(tmp_path / "inverted.png"))
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert read(tmp_path / "plain.png") != read(tmp_path / "inverted.png")
+
+
+def test_least_recently_used_are_evicted(cache, tmp_path):
+    cache.max_size = 250
+    for i, key in enumerate("abc"):
+        path = tmp_path / key
+        path.write_bytes(bytes(100))
+        cache.put(f"{key * 8}.png", str(path))
+        # explicit times, so the order doesn't depend on the filesystem's timestamp resolution
+        os.utime(cache._entry(f"{key * 8}.png"), (1000 + i, 1000 + i))
+        if key == "b":
+            assert cache.get("aaaaaaaa.png", str(tmp_path / "out"))
+            os.utime(cache._entry("aaaaaaaa.png"), (2000, 2000))
+    # c went past the limit, and b was the least recently used
+    assert cache.get("aaaaaaaa.png", str(tmp_path / "out"))
+    assert not cache.get("bbbbbbbb.png", str(tmp_path / "out"))
+    assert cache.get("cccccccc.png", str(tmp_path / "out"))
+    assert cache.size == 200
+
+    cache.clear()
+    assert cache.size == 0 and (cache.hits, cache.misses) == (0, 0)
@@ -0,0 +1,32 @@
+import colorsys
+import itertools
+
+import numpy as np
+import pytest
+
+from asciipy import ImageConverter, ConverterConfig, BackgroundConfig, _darken_hls
+
+
+def colors():
+    rng = np.random.default_rng(1)
+    return np.concatenate((
+        rng.integers(0, 256, (20000, 3)),
+        np.array(list(itertools.product([0, 1, 127, 128, 254, 255], repeat=3))),
+    ))
+
+
+@pytest.mark.parametrize("darken", [0.0, 0.5, 0.9, 1.0, 1.7])
+def test_darken_matches_colorsys(darken):
+    rgb = colors()
+    expected = []
+    for r, g, b in rgb.tolist():
+        h, l, s = colorsys.rgb_to_hls(r / 255.0, g / 255.0, b / 255.0)
+        l = max(min(l * darken, 1.0), 0.0)
+        expected.append([int(v * 255) for v in colorsys.hls_to_rgb(h, l, s)])
+    assert np.array_equal(_darken_hls(rgb, darken), np.array(expected))
+
+
+def test_darken_matches_hook():
+    converter = ImageConverter(ConverterConfig(), BackgroundConfig(darken=0.3))
+    rgb = colors()[::50]
+    assert np.array_equal(converter._darken_array(rgb), np.array([converter._darken_rgb(*color) for color in rgb.tolist()]))
@@ -0,0 +1,97 @@
+import glob
+import io
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+from PIL import Image
+
+pytest.importorskip("requests")
+
+from asciipy import ImageConverter, GifConverter, VideoConverter, ConverterConfig, BackgroundConfig
+
+from conftest import synthetic, write_video
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_progressive_stream_downloads_once(server, workdir, monkeypatch):
+    write_video(os.path.join(server.directory, "clip.avi"))
+    commands = []
+    popen = subprocess.Popen
+    monkeypatch.setattr(subprocess, "Popen", lambda args, *rest, **kwargs: commands.append(args) or popen(args, *rest, **kwargs))
+    converter = VideoConverter(ConverterConfig(width=20, progressive=True), progress=False, stream=True)
+    converter.convert(server.url("clip.avi"), "out.mp4")
+    # the audio is muxed from the local download, not fetched from the url a second time
+    assert len(server.requests("clip.avi")) == 1
+    assert not any(server.url("clip.avi") in map(str, args) for args in commands)
+    assert os.path.getsize("out.mp4") > 0
+    assert glob.glob("video_*.mp4") == []
+
+
+def test_progressive_image_matches_local(server, workdir):
+    path = os.path.join(server.directory, "image.png")
+    synthetic(200, 150).save(path)
+    ImageConverter(ConverterConfig(width=40, transparent=True, progressive=True), BackgroundConfig()).convert(server.url("image.png"), "remote.png")
+    ImageConverter(ConverterConfig(width=40, transparent=True), BackgroundConfig()).convert(path, "local.png")
+    assert np.array_equal(np.asarray(Image.open("remote.png")), np.asarray(Image.open("local.png")))
+    assert len(server.requests("image.png")) == 1
+
+
+def test_progressive_video_matches_local(server, workdir):
+    path = write_video(os.path.join(server.directory, "clip.avi"))
+    remote, local = io.StringIO(), io.StringIO()
+    VideoConverter(ConverterConfig(width=20, progressive=True, text_mode="plain"), progress=False).convert(server.url("clip.avi"), remote)
+    VideoConverter(ConverterConfig(width=20, text_mode="plain"), progress=False).convert(path, local)
+    assert remote.getvalue() == local.getvalue()
+    assert remote.getvalue().count("\f") == 19
+
+
+@pytest.mark.parametrize("converter", [ImageConverter, GifConverter])
+def test_progressive_reader_is_closed(server, workdir, monkeypatch, converter):
+    from asciipy.url_ import _Download
+    frames = [synthetic(60, 40, seed=i).convert("RGB") for i in range(3)]
+    frames[0].save(os.path.join(server.directory, "anim.gif"), save_all=True, append_images=frames[1:])
+    readers = []
+    _open = _Download.open
+    monkeypatch.setattr(_Download, "open", lambda self: readers.append(_open(self)) or readers[-1])
+    converter(ConverterConfig(width=20, progressive=True)).convert(server.url("anim.gif"), "out.gif")
+    assert len(readers) == 1 and readers[0].closed
+
+
+def test_download_revalidates_with_etag(server, workdir):
+    from asciipy.url_ import download
+    path = os.path.join(server.directory, "image.png")
+    synthetic(40, 30).save(path)
+    name = download(server.url("image.png"))
+    with open(f"./downloaded/{name}", "rb") as f:
+        first = f.read()
+    assert download(server.url("image.png")) == name
+    etags = server.requests("image.png")
+    # the second request revalidates the copy on disk, and gets a 304 back
+    assert etags[0] is None and etags[1] is not None
+    with open(f"./downloaded/{name}", "rb") as f:
+        assert f.read() == first
+
+    synthetic(40, 30, seed=1).save(path)
+    download(server.url("image.png"))
+    with open(path, "rb") as f, open(f"./downloaded/{name}", "rb") as g:
+        assert f.read() == g.read()
+
+
+def test_failed_download_leaves_nothing(server, workdir):
+    import requests
+    from asciipy.url_ import download
+    with pytest.raises(requests.HTTPError):
+        download(server.url("missing.png"))
+    assert os.listdir("./downloaded") == []
+
+
+def test_url_image_matches_local(server, workdir):
+    path = os.path.join(server.directory, "image.png")
+    synthetic(200, 150).save(path)
+    ImageConverter(ConverterConfig(width=40, transparent=True), BackgroundConfig()).convert(server.url("image.png"), "remote.png")
+    ImageConverter(ConverterConfig(width=40, transparent=True), BackgroundConfig()).convert(path, "local.png")
+    assert np.array_equal(np.asarray(Image.open("remote.png")), np.asarray(Image.open("local.png")))
+    assert len(server.requests("image.png")) == 1
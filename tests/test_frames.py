@@ -0,0 +1,60 @@
+import io
+
+import numpy as np
+import pytest
+
+from asciipy import VideoConverter, ConverterConfig
+
+from conftest import synthetic
+
+SIZE = (64, 48)
+
+
+def arrays(count=5):
+    return [np.asarray(synthetic(*SIZE, seed=i).convert("RGB")) for i in range(count)]
+
+
+def raw(frames):
+    return b"".join(frame.tobytes() for frame in frames)
+
+
+def converter(**options):
+    return VideoConverter(ConverterConfig(width=16, **options), progress=False)
+
+
+def test_stream_matches_arrays():
+    frames = arrays()
+    # a partial frame at the end of the stream is dropped
+    stream = io.BytesIO(raw(frames) + bytes(100))
+    from_stream, from_arrays = io.BytesIO(), io.BytesIO()
+    assert converter().convert_frames(stream, from_stream, size=SIZE) == 5
+    assert converter().convert_frames(iter(frames), from_arrays) == 5
+    assert from_stream.getvalue() == from_arrays.getvalue()
+
+    width, height = converter().frame_size(SIZE)
+    data = np.frombuffer(from_stream.getvalue(), dtype=np.uint8).reshape(5, height, width, 3)
+    single = converter()
+    for frame, converted in zip(frames, data):
+        expected = single._process_image(single._frame_image(frame, True))
+        assert np.array_equal(converted, np.asarray(expected))
+
+
+@pytest.mark.parametrize("mode", ["plain", "truecolor"])
+def test_text_frames(mode, tmp_path):
+    frames = arrays(3)
+    path = tmp_path / "frames.raw"
+    path.write_bytes(raw(frames))
+    output = io.StringIO()
+    assert converter(text_mode=mode).convert_frames(str(path), output, size=SIZE) == 3
+    text = output.getvalue()
+    if mode == "plain":
+        pages = text.split("\f")
+        assert len(pages) == 3 and all(page.count("\n") == 6 for page in pages)
+    else:
+        # every frame is drawn over the last one, the first clears the screen
+        assert text.startswith("\x1b[2J\x1b[H") and text.count("\x1b[H") == 3
+
+
+def test_stream_needs_a_size():
+    with pytest.raises(ValueError):
+        converter().convert_frames(io.BytesIO(raw(arrays(1))), io.BytesIO())
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from asciipy import GifConverter, ConverterConfig
+
+from conftest import synthetic
+
+DURATIONS = [40, 80, 120, 200, 60]
+
+
+@pytest.fixture
+def animated(tmp_path):
+    frames = [synthetic(60, 40, seed=i).convert("RGB") for i in range(len(DURATIONS))]
+    path = tmp_path / "in.gif"
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=DURATIONS, loop=0)
+    return str(path)
+
+
+def read(path):
+    with Image.open(path) as img:
+        return [(np.asarray(frame.convert("RGB")), frame.info.get("duration")) for frame in ImageSequence.Iterator(img)]
+
+
+@pytest.mark.parametrize("converters", [1, 2])
+def test_frames_keep_their_duration(animated, tmp_path, converters):
+    output = str(tmp_path / "out.gif")
+    GifConverter(ConverterConfig(width=30), converters=converters).convert(animated, output)
+    assert [duration for _, duration in read(output)] == DURATIONS
+
+
+def test_pool_matches_single_process(animated, tmp_path):
+    GifConverter(ConverterConfig(width=30, transparent=True)).convert(animated, str(tmp_path / "single.gif"))
+    GifConverter(ConverterConfig(width=30, transparent=True), converters=2).convert(animated, str(tmp_path / "pool.gif"))
+    single, pool = read(str(tmp_path / "single.gif")), read(str(tmp_path / "pool.gif"))
+    assert len(single) == len(pool) == len(DURATIONS)
+    assert all(np.array_equal(a, b) for (a, _), (b, _) in zip(single, pool))
+
+
+def test_first_frame_only(animated, tmp_path):
+    output = str(tmp_path / "out.png")
+    GifConverter(ConverterConfig(width=30), gif=False).convert(animated, output)
+    with Image.open(output) as img:
+        assert getattr(img, "n_frames", 1) == 1
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from asciipy import GifConverter, VideoConverter, ConverterConfig, BackgroundConfig
+
+from conftest import synthetic
+
+
+@pytest.mark.parametrize("transparent", [False, True])
+@pytest.mark.parametrize("background", [None, BackgroundConfig()])
+def test_incremental_matches_full_redraw(background, transparent):
+    rng = np.random.default_rng(2)
+    frame = np.asarray(synthetic(48, 24)).copy()
+    incremental = VideoConverter(ConverterConfig(width=48, transparent=transparent), background, incremental=True)
+    full = VideoConverter(ConverterConfig(width=48, transparent=transparent), background)
+    for i in range(8):
+        # a few cells change between frames, and every third frame nothing does
+        if i % 3:
+            ys, xs = rng.integers(0, 24, 10), rng.integers(0, 48, 10)
+            frame[ys, xs] = rng.integers(0, 256, (10, 4))
+        img = Image.fromarray(frame, "RGBA").convert(full._mode)
+        drawn = incremental.cells_drawn
+        assert np.array_equal(np.asarray(incremental._process_image(img, reuse=True)), np.asarray(full._process_image(img)))
+        if i > 0:
+            assert incremental.cells_drawn - drawn < 48 * 24
+    assert incremental.cells_reused > 0
+
+
+def test_incremental_gif(tmp_path):
+    frame = np.asarray(synthetic(40, 30).convert("RGB")).copy()
+    frames = []
+    for i in range(5):
+        frame[i * 5:i * 5 + 5, :10] = 255 - frame[i * 5:i * 5 + 5, :10]
+        frames.append(Image.fromarray(frame))
+    frames[0].save(tmp_path / "in.gif", save_all=True, append_images=frames[1:], duration=100, loop=0)
+    incremental = GifConverter(ConverterConfig(width=40), incremental=True)
+    incremental.convert(str(tmp_path / "in.gif"), str(tmp_path / "incremental.gif"))
+    GifConverter(ConverterConfig(width=40)).convert(str(tmp_path / "in.gif"), str(tmp_path / "full.gif"))
+    read = lambda name: [np.asarray(f.convert("RGB")) for f in ImageSequence.Iterator(Image.open(tmp_path / name))]
+    converted, expected = read("incremental.gif"), read("full.gif")
+    assert len(converted) == len(expected) == 5
+    assert all(np.array_equal(a, b) for a, b in zip(converted, expected))
+    assert incremental.cells_reused > 0 and 0 < incremental.hit_rate < 1
@@ -0,0 +1,92 @@
+import io
+
+import pytest
+from PIL import features
+
+from asciipy import GifConverter, ImageConverter, VideoConverter, ConverterConfig, probe
+from asciipy.cli import _converter
+
+from conftest import synthetic, write_video
+
+
+def frames(count, mode="RGB"):
+    return [synthetic(30, 20, seed=i).convert(mode) for i in range(count)]
+
+
+def save(path, images, **kwargs):
+    if len(images) > 1:
+        kwargs.update(save_all=True, append_images=images[1:])
+    images[0].save(path, **kwargs)
+    return path
+
+
+# file name, images, save options, and what probe should find: kind, format, frames, alpha
+CASES = {
+    "png": ("a.png", lambda: frames(1), {}, ("image", "png", 1, False)),
+    "png_alpha": ("a.png", lambda: frames(1, "RGBA"), {}, ("image", "png", 1, True)),
+    "png_palette_transparency": ("a.png", lambda: frames(1, "P"), {"transparency": 0}, ("image", "png", 1, True)),
+    "apng": ("a.png", lambda: frames(3), {"duration": 50}, ("animation", "png", 3, False)),
+    "gif": ("a.gif", lambda: frames(1), {}, ("image", "gif", 1, False)),
+    "gif_animated": ("a.gif", lambda: frames(4), {"duration": 50}, ("animation", "gif", 4, False)),
+    "jpeg": ("a.jpg", lambda: frames(1), {}, ("image", "jpeg", 1, False)),
+    "bmp": ("a.bmp", lambda: frames(1), {}, ("image", "bmp", 1, False)),
+    "webp": ("a.webp", lambda: frames(1), {}, ("image", "webp", 1, False)),
+    "webp_lossless_alpha": ("a.webp", lambda: frames(1, "RGBA"), {"lossless": True}, ("image", "webp", 1, True)),
+    "webp_animated": ("a.webp", lambda: frames(3), {"duration": 50}, ("animation", "webp", 3, False)),
+    "tiff": ("a.tiff", lambda: frames(1), {}, ("image", "tiff", 1, False)),
+}
+
+
+@pytest.mark.parametrize("case", [
+    pytest.param(case, marks=pytest.mark.skipif(case.startswith("webp") and not features.check("webp"), reason="pillow was built without webp"))
+    for case in CASES
+])
+def test_images(case, tmp_path):
+    name, images, options, (kind, format, count, alpha) = CASES[case]
+    path = save(str(tmp_path / name), images(), **options)
+    media = probe(path)
+    assert (media.kind, media.format, media.frames, media.alpha) == (kind, format, count, alpha)
+    assert (media.width, media.height) == (30, 20)
+
+
+def test_gif_fps(tmp_path):
+    path = save(str(tmp_path / "a.gif"), frames(4), duration=50)
+    assert probe(path).fps == pytest.approx(20.0)
+
+
+def test_avi(tmp_path):
+    media = probe(write_video(str(tmp_path / "a.avi"), frames=12, size=(64, 48), fps=12.5))
+    assert (media.kind, media.format, media.width, media.height, media.frames) == ("video", "avi", 64, 48, 12)
+    assert media.fps == pytest.approx(12.5)
+
+
+@pytest.mark.parametrize("head, format", [
+    (b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00", "mp4"),
+    (b"\x1a\x45\xdf\xa3\x01\x00\x00\x00", "matroska"),
+    (b"OggS\x00\x02", "ogg"),
+    (b"not media at all", None),
+])
+def test_video_headers(head, format):
+    media = probe(io.BytesIO(head + bytes(256)))
+    assert (media.kind, media.format) == ("video", format)
+
+
+def test_file_position_is_restored(tmp_path):
+    data = io.BytesIO()
+    data.write(b"prefix")
+    synthetic(30, 20).save(data, "PNG")
+    data.seek(6)
+    assert probe(data).format == "png"
+    assert data.tell() == 6
+
+
+@pytest.mark.parametrize("kind, converter", [("image", ImageConverter), ("animation", GifConverter), ("video", VideoConverter)])
+def test_cli_picks_converter(kind, converter, tmp_path):
+    paths = {
+        "image": lambda: save(str(tmp_path / "a.png"), frames(1)),
+        "animation": lambda: save(str(tmp_path / "a.gif"), frames(3)),
+        "video": lambda: write_video(str(tmp_path / "a.avi")),
+    }
+    media = probe(paths[kind]())
+    assert media.kind == kind
+    assert type(_converter(media, ConverterConfig())) is converter
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from asciipy import ImageConverter, ConverterConfig, palettes, _nearest_color
+
+
+def nearest(palette, rgb):
+    # the per-pixel lookup the tables replace, ties go to the smallest color
+    converter = ImageConverter(ConverterConfig(palette=palette))
+    return np.array([converter._get_color(tuple(color)) for color in rgb.tolist()])
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASCIIPY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(palettes, "_tables", {})
+    return tmp_path
+
+
+def test_custom_palette_ties_go_to_the_smallest_color():
+    # (1, 0, 0) is as far from (0, 0, 0) as from (2, 0, 0), and (3, 3, 3) ties three ways
+    palette = [(6, 6, 0), (2, 0, 0), (0, 6, 6), (0, 0, 0), (6, 0, 6)]
+    rgb = np.array([(1, 0, 0), (3, 3, 3), (3, 3, 0), (4, 0, 1), (0, 0, 0)], dtype=np.uint8)
+    assert np.array_equal(_nearest_color(rgb, palette), nearest(palette, rgb))
+
+
+def test_custom_palette_fills_lazily():
+    rng = np.random.default_rng(3)
+    palette = [tuple(color) for color in rng.integers(0, 256, (7, 3)).tolist()]
+    first = rng.integers(0, 256, (40, 30, 3), dtype=np.uint8)
+    colors, table = palettes._compile(palette)
+    assert table.dtype == np.uint16 and not table.any()
+
+    assert np.array_equal(_nearest_color(first, palette), nearest(palette, first.reshape(-1, 3)).reshape(first.shape))
+    # only the colors that were looked up are known
+    assert np.count_nonzero(table) == len(np.unique(first.reshape(-1, 3), axis=0))
+
+    # colors seen before and new ones mix in the next frame
+    second = np.concatenate((first[:20], rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)))
+    assert np.array_equal(palettes._lookup(palette, second), palettes._build_table(colors)[second[..., 0], second[..., 1], second[..., 2]])
+
+
+@pytest.mark.parametrize("name", ["c64", "nes", "cmd", "grayscale"])
+def test_builtin_table_is_cached(name, cache_dir):
+    palette = getattr(palettes, name)
+    rgb = np.random.default_rng(4).integers(0, 256, (500, 3), dtype=np.uint8)
+    assert np.array_equal(_nearest_color(rgb, palette), nearest(palette, rgb))
+    assert len(list((cache_dir / "palettes").glob(f"{name}-*.npy"))) == 1
+    # a new process loads the table from disk
+    palettes._tables.clear()
+    assert np.array_equal(_nearest_color(rgb, palette), nearest(palette, rgb))
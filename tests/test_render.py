@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from asciipy import ImageConverter, ConverterConfig, BackgroundConfig, palettes
+
+from conftest import fonts, synthetic
+
+PALETTES = [None, palettes.c64, palettes.grayscale, [(250, 10, 10), (10, 250, 10), (10, 10, 250)]]
+BACKGROUNDS = {
+    "none": lambda palette: None,
+    "darken": lambda palette: BackgroundConfig(),
+    "palette": lambda palette: BackgroundConfig(palette=palette or palettes.nes),
+    "color": lambda palette: BackgroundConfig(color=(20, 40, 60), alpha=False),
+    "back_layer": lambda palette: BackgroundConfig(back_layer=(1, 2, 3), back_threshold=100),
+}
+
+
+@pytest.mark.parametrize("font", fonts)
+@pytest.mark.parametrize("transparent", [False, True])
+@pytest.mark.parametrize("background", list(BACKGROUNDS))
+@pytest.mark.parametrize("palette", range(len(PALETTES)))
+def test_vectorized_matches_per_pixel(palette, background, transparent, font):
+    palette = PALETTES[palette]
+    converter = ImageConverter(ConverterConfig(width=24, palette=palette, transparent=transparent, font=font, font_size=12 if font else None), BACKGROUNDS[background](palette))
+    img = synthetic(24, 12).convert(converter._mode)
+    assert np.array_equal(np.asarray(converter._process_image(img)), np.asarray(converter._process_pixels(img)))
+
+
+def test_overridden_hooks_use_per_pixel():
+    class Gray(ImageConverter):
+        def _get_color(self, col):
+            gray = round(sum(col[:3]) / 3)
+            return (gray, gray, gray)
+
+    converter = Gray(ConverterConfig(width=16))
+    img = synthetic(16, 8).convert("RGB")
+    assert converter._hooks_overridden()
+    assert np.array_equal(np.asarray(converter._process_image(img)), np.asarray(converter._draw_pixels(img)))
+
+
+@pytest.mark.parametrize("transparent", [False, True])
+@pytest.mark.parametrize("background", [None, BackgroundConfig(), BackgroundConfig(back_layer=(10, 20, 30))])
+def test_bands_match_serial(background, transparent):
+    img = synthetic(160, 90)
+    serial = ImageConverter(ConverterConfig(width=160, transparent=transparent), background)
+    banded = ImageConverter(ConverterConfig(width=160, transparent=transparent, render_workers=4), background)
+    assert np.array_equal(np.asarray(banded._process_image(img.convert(banded._mode))), np.asarray(serial._process_image(img.convert(serial._mode))))
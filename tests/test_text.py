@@ -0,0 +1,99 @@
+import io
+
+import numpy as np
+import pytest
+
+from asciipy import ImageConverter, ConverterConfig, BackgroundConfig
+from asciipy.text import _ansi256, _format_text
+
+from conftest import synthetic
+
+GLYPHS = "gS#%@"
+XTERM = np.array(
+    [(r, g, b) for r in (0, 95, 135, 175, 215, 255) for g in (0, 95, 135, 175, 215, 255) for b in (0, 95, 135, 175, 215, 255)]
+    + [(v, v, v) for v in range(8, 239, 10)]
+)
+
+
+def escape(color, mode, back):
+    # one escape sequence per cell, None is the terminal's default color
+    if color is None:
+        return "\x1b[49m" if back else "\x1b[39m"
+    if mode == "ansi256":
+        return f"\x1b[{48 if back else 38};5;{int(_ansi256(np.array(color)))}m"
+    return f"\x1b[{48 if back else 38};2;{color[0]};{color[1]};{color[2]}m"
+
+
+def reference(chars, fore, fore_mask, back, back_mask, back_layer, mode):
+    # the grid written cell by cell, with an escape wherever the terminal's color has to change
+    lines = []
+    for y in range(chars.shape[0]):
+        line, current_fore, current_back = "", None, None
+        for x in range(chars.shape[1]):
+            cell_back = None
+            if back is not None:
+                if back_mask[y, x]:
+                    cell_back = tuple(back[y, x, :3])
+                elif back_layer is not None:
+                    cell_back = back_layer
+            if mode != "plain":
+                # spaces keep whatever foreground color is set
+                if fore_mask[y, x] and escape(tuple(fore[y, x, :3]), mode, False) != escape(current_fore, mode, False):
+                    current_fore = tuple(fore[y, x, :3])
+                    line += escape(current_fore, mode, False)
+                if escape(cell_back, mode, True) != escape(current_back, mode, True):
+                    current_back = cell_back
+                    line += escape(current_back, mode, True)
+            line += GLYPHS[chars[y, x]] if fore_mask[y, x] else " "
+        if current_fore is not None or current_back is not None:
+            line += "\x1b[0m"
+        lines.append(line + "\n")
+    return "".join(lines)
+
+
+@pytest.mark.parametrize("mode", ["plain", "ansi256", "truecolor"])
+@pytest.mark.parametrize("background", ["none", "back", "back_layer"])
+def test_format_matches_per_cell(mode, background):
+    rng = np.random.default_rng(5)
+    shape = (12, 30)
+    # few distinct colors, so runs of equal colors are common
+    colors = rng.integers(0, 256, (4, 3))
+    chars = rng.integers(0, len(GLYPHS), shape)
+    fore = colors[rng.integers(0, 4, shape)]
+    fore_mask = rng.random(shape) > 0.2
+    back = back_mask = back_layer = None
+    if background != "none":
+        back = colors[rng.integers(0, 4, shape)]
+        back_mask = rng.random(shape) > 0.3
+    if background == "back_layer":
+        back_layer = (1, 2, 3)
+    text = _format_text(chars, GLYPHS, fore, fore_mask, back, back_mask, back_layer=back_layer, mode=mode)
+    assert text == reference(chars, fore, fore_mask, back, back_mask, back_layer, mode)
+
+
+def test_ansi256_is_nearest():
+    rgb = np.random.default_rng(6).integers(0, 256, (5000, 3))
+    index = _ansi256(rgb)
+    assert index.min() >= 16
+    distances = ((rgb[:, None, :] - XTERM[None, :, :]) ** 2).sum(axis=-1)
+    assert np.array_equal(distances[np.arange(len(rgb)), index - 16], distances.min(axis=1))
+
+
+@pytest.mark.parametrize("mode", ["plain", "ansi256", "truecolor"])
+def test_converter_writes_text(mode, tmp_path):
+    source = str(tmp_path / "in.png")
+    synthetic(80, 40).save(source)
+    output = io.StringIO()
+    converter = ImageConverter(ConverterConfig(width=20, text_mode=mode), BackgroundConfig())
+    converter.convert(source, output)
+    lines = output.getvalue().split("\n")
+    # 20 cells wide, half as many rows as the aspect ratio gives, since cells are twice as tall as wide
+    assert len(lines) == 6 and lines[-1] == ""
+    if mode == "plain":
+        assert all(len(line) == 20 for line in lines[:-1])
+    else:
+        assert all(line.endswith("\x1b[0m") for line in lines[:-1])
+    # a path gets the same text
+    converter.convert(source, str(tmp_path / "out.txt"))
+    with open(tmp_path / "out.txt", encoding="utf-8", newline="") as f:
+        assert f.read() == output.getvalue()